@@ -0,0 +1,82 @@
+"""
+Per-row vs bulk deactivation of triggered markets on a file-backed SQLite DB.
+
+Usage:
+    python -m benchmarks.bulk_deactivation [--markets 10000] [--triggered 500]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.bootstrap.database import create_session_maker
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.market import Market, MarketCondition
+from src.infrastructure.db.models.user import User
+from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+
+
+async def seed(engine, markets: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": 1, "username": "bench", "full_name": "Bench"}])
+        await conn.execute(
+            insert(Market),
+            [
+                {
+                    "user_id": 1,
+                    "market_id": str(i),
+                    "token_id": f"token-{i}",
+                    "market_url": "https://polymarket.com/event/bench",
+                    "target_price": 50,
+                    "condition": MarketCondition.GE,
+                    "is_active": True,
+                }
+                for i in range(markets)
+            ],
+        )
+
+
+async def run(markets: int, triggered: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        session_maker = create_session_maker(engine)
+        ids = list(range(1, triggered + 1))
+
+        await seed(engine, markets)
+        async with session_maker() as session:
+            repo = SQLAlchemyMarketRepository(session)
+            started = time.perf_counter()
+            for market_id in ids:
+                await repo.update_market_status(market_id, is_active=False)
+            per_row = time.perf_counter() - started
+
+        await seed(engine, markets)
+        async with session_maker() as session:
+            repo = SQLAlchemyMarketRepository(session)
+            started = time.perf_counter()
+            await repo.deactivate_markets(ids)
+            bulk = time.perf_counter() - started
+
+        await engine.dispose()
+
+    print(f"markets={markets} triggered={triggered}")
+    print(f"  per-row: {per_row * 1000:9.1f} ms  {triggered / per_row:10.0f} markets/s")
+    print(f"  bulk:    {bulk * 1000:9.1f} ms  {triggered / bulk:10.0f} markets/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--markets", type=int, default=10_000)
+    parser.add_argument("--triggered", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.markets, args.triggered))
+
+
+if __name__ == "__main__":
+    main()
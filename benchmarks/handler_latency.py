@@ -0,0 +1,212 @@
+"""
+Per-update cost of building use cases, eagerly versus on demand.
+
+Feeds synthetic updates through a Dispatcher wired like main.py (same
+middlewares, routers and dialogs) with a Telegram session that answers every
+method instantly and a temporary SQLite database. In "eager" mode every update
+opens a session and builds all use cases before the handler runs, as
+UseCaseMiddleware used to; in "lazy" mode only what the matched handler asks
+for is built. /start goes through the user profile cache as in main.py, so
+only a user's first /start writes. Reports per update kind the median and
+p99 latency, the time spent building dependencies and how many updates
+created a DB session.
+
+Usage:
+    python -m benchmarks.handler_latency [--updates 2000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, Message, Update, User as TelegramUser
+from aiogram_dialog import setup_dialogs
+from sqlalchemy import insert
+
+from src.bootstrap.container import UseCaseContainer
+from src.bootstrap.database import create_engine, create_session_maker
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.market import Market, MarketCondition
+from src.infrastructure.db.models.user import User
+from src.infrastructure.db.repositories.cached_user import UserProfileCache
+from src.infrastructure.i18n.setup import setup_i18n
+from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+from src.presentation.dialogs.add_market import add_market_dialog
+from src.presentation.dialogs.market_list import market_list_dialog
+from src.presentation.handlers.errors import router as errors_router
+from src.presentation.handlers.market import router as market_router
+from src.presentation.handlers.start import router as start_router
+from src.presentation.middlewares.db import DbSessionMiddleware
+from src.presentation.middlewares.i18n import I18nMiddleware
+from src.presentation.middlewares.metrics import HandlerMetricsMiddleware
+from src.presentation.middlewares.use_cases import HandlerUseCasesMiddleware, UseCaseMiddleware
+
+USERS = 100
+# Updates without a database: a message no handler matches and /add
+KINDS = ("unhandled", "/add", "enable_mon", "/start", "/markets")
+
+
+class SinkSession(BaseSession):
+    """Answers every Bot API method at once without a network round trip."""
+
+    async def make_request(self, bot, method, timeout=None):
+        if method.__returning__ is Message:
+            chat_id = getattr(method, "chat_id", 1)
+            return Message(
+                message_id=1,
+                date=datetime.now(timezone.utc),
+                chat=Chat(id=chat_id, type="private"),
+                text=getattr(method, "text", None),
+            )
+        return True
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+class BenchmarkUseCaseMiddleware(UseCaseMiddleware):
+    """UseCaseMiddleware that can behave like the old eager one and records each scope."""
+
+    def __init__(self):
+        self.eager = False
+        self.scopes: list[UseCaseContainer] = []
+
+    async def __call__(self, handler, event, data):
+        async def record(event, data):
+            container: UseCaseContainer = data["use_cases"]
+            self.scopes.append(container)
+            if self.eager:
+                for name in UseCaseContainer.USE_CASES:
+                    getattr(container, name)
+            return await handler(event, data)
+
+        return await super().__call__(record, event, data)
+
+
+def make_update(update_id: int, kind: str) -> Update:
+    user_id = update_id % USERS + 1
+    user = TelegramUser(id=user_id, is_bot=False, first_name=f"User {user_id}")
+    chat = Chat(id=user_id, type="private")
+    now = datetime.now(timezone.utc)
+    if kind == "enable_mon":
+        message = Message(message_id=1, date=now, chat=chat, text="alert")
+        return Update(
+            update_id=update_id,
+            callback_query=CallbackQuery(
+                id=str(update_id),
+                from_user=user,
+                chat_instance="bench",
+                message=message,
+                data=f"enable_mon:{user_id}",
+            ),
+        )
+    text = "hello" if kind == "unhandled" else kind
+    return Update(update_id=update_id, message=Message(message_id=update_id, date=now, chat=chat, from_user=user, text=text))
+
+
+async def seed(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": i, "full_name": f"User {i}"} for i in range(1, USERS + 1)])
+        await conn.execute(
+            insert(Market),
+            [
+                {
+                    "id": i,
+                    "user_id": i,
+                    "market_id": str(i),
+                    "token_id": f"token-{i}",
+                    "market_url": "https://polymarket.com/event/bench",
+                    "target_price": 50,
+                    "condition": MarketCondition.GE,
+                    "is_active": False,
+                }
+                for i in range(1, USERS + 1)
+            ],
+        )
+
+
+def build_dispatcher(session_maker, middleware: BenchmarkUseCaseMiddleware) -> Dispatcher:
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.update.middleware(DbSessionMiddleware(session_maker))
+    dp["polymarket_api"] = None
+    dp["market_registry"] = ActiveMarketRegistry(session_maker)
+    dp["user_profile_cache"] = UserProfileCache(session_maker)
+    dp.update.middleware(middleware)
+    dp.update.middleware(I18nMiddleware(setup_i18n()))
+    for event_type, observer in dp.observers.items():
+        if event_type not in ("update", "error"):
+            observer.middleware(HandlerUseCasesMiddleware())
+            observer.middleware(HandlerMetricsMiddleware(event_type))
+    errors_router.include_routers(start_router, market_router, add_market_dialog, market_list_dialog)
+    dp.include_router(errors_router)
+    setup_dialogs(dp)
+    return dp
+
+
+def percentile(values: list[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(dp: Dispatcher, bot: Bot, middleware: BenchmarkUseCaseMiddleware, eager: bool, updates: int) -> dict:
+    middleware.eager = eager
+    results = {}
+    update_id = 0
+    for kind in KINDS:
+        middleware.scopes.clear()
+        # Users left inside the /markets dialog would route plain text to it
+        dp.fsm.storage.storage.clear()
+        latencies = []
+        for _ in range(updates):
+            update_id += 1
+            update = make_update(update_id, kind)
+            started = time.perf_counter()
+            await dp.feed_update(bot, update)
+            latencies.append(time.perf_counter() - started)
+        results[kind] = {
+            "p50": percentile(latencies, 0.5),
+            "p99": percentile(latencies, 0.99),
+            "build": sum(s.build_seconds for s in middleware.scopes) / len(middleware.scopes),
+            "sessions": sum(s.session_opened for s in middleware.scopes) / len(middleware.scopes),
+        }
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=2_000, help="updates per kind and mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'handlers.sqlite3')}")
+        await seed(engine)
+        middleware = BenchmarkUseCaseMiddleware()
+        dp = build_dispatcher(create_session_maker(engine), middleware)
+        bot = Bot(token="42:benchmark", session=SinkSession())
+
+        # Warm up imports, templates and the connection pool
+        await run(dp, bot, middleware, eager=True, updates=50)
+        results = {mode: await run(dp, bot, middleware, mode == "eager", args.updates) for mode in ("eager", "lazy")}
+        await engine.dispose()
+
+    print(f"{'update':<11} {'mode':<6} {'p50 us':>8} {'p99 us':>8} {'build us':>9} {'sessions':>9}")
+    for kind in KINDS:
+        for mode in ("eager", "lazy"):
+            r = results[mode][kind]
+            print(
+                f"{kind:<11} {mode:<6} {r['p50'] * 1e6:>8.0f} {r['p99'] * 1e6:>8.0f} "
+                f"{r['build'] * 1e6:>9.1f} {r['sessions']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,396 @@
+"""
+End-to-end cost of a monitor tick at several subscription counts.
+
+For every scale a fresh process seeds a file-backed SQLite DB with
+`scale / --per-user` users holding `--per-user` subscriptions each (about
+`--per-token` subscriptions share a token), loads the registry and runs
+`MarketMonitorService.check_markets` `--ticks` times against the fake
+Polymarket server, which runs in a process of its own. `--trigger-rate` of the
+subscriptions fire on the first tick, later ticks are steady state.
+
+Reported per tick: wall time, time in DB statements, time with at least one
+price request in flight, trigger evaluation time, and notifications delivered
+per second by the dispatcher (into a sink bot, without Telegram rate limits).
+Peak RSS is that of the scale's process. Results are written as JSON; pass a
+previous file to --compare to see the change.
+
+Usage:
+    python -m benchmarks.monitor_tick [--scales 1000,10000,100000,1000000] [--output monitor_tick.json]
+    python -m benchmarks.monitor_tick --scales 10000 --compare monitor_tick.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from statistics import median
+
+from sqlalchemy import event, insert
+
+SEED = 7
+INSERT_BATCH = 50_000
+
+
+class SinkBot:
+    """Accepts every message instantly, so the dispatcher is the only limit."""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent += 1
+
+
+class TimedApi:
+    """Measures the time during which at least one price request is in flight."""
+
+    def __init__(self, api):
+        self.api = api
+        self.requests = 0
+        self.busy_seconds = 0.0
+        self._in_flight = 0
+        self._busy_since = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+    async def _timed(self, call):
+        if self._in_flight == 0:
+            self._busy_since = time.perf_counter()
+        self._in_flight += 1
+        self.requests += 1
+        try:
+            return await call
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self.busy_seconds += time.perf_counter() - self._busy_since
+
+    async def get_prices_batch(self, token_ids):
+        return await self._timed(self.api.get_prices_batch(token_ids))
+
+    async def get_quotes_batch(self, token_ids):
+        return await self._timed(self.api.get_quotes_batch(token_ids))
+
+
+def _token_count(scale: int, args: argparse.Namespace) -> int:
+    # A user's subscriptions must be on distinct markets
+    return max(args.per_user, scale // args.per_token)
+
+
+def _serve(port: int, tokens: int, latency: float):
+    from aiohttp import web
+
+    from src.infrastructure.polymarket.fake_server import Catalog, Faults, create_app
+
+    # No random walk during the run, so the seeded targets fire exactly as planned
+    app = create_app(interval=3600, faults=Faults(latency=latency), catalog=Catalog(tokens, seed=SEED))
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _subscriptions(scale: int, per_user: int, tokens: int, trigger_rate: float):
+    from src.infrastructure.db.models.market import MarketCondition
+    from src.infrastructure.polymarket.fake_server import Catalog
+
+    catalog = Catalog(tokens, seed=SEED)
+    rng = random.Random(SEED)
+    for i in range(scale):
+        index = i % tokens
+        token_id = catalog.token_ids(index)[0]
+        cents = catalog.initial_price(token_id) * 100
+        if rng.random() < trigger_rate:
+            condition, target = MarketCondition.GE, max(1, math.floor(cents) - rng.randint(0, 3))
+        elif cents < 90:
+            condition, target = MarketCondition.GE, rng.randint(math.ceil(cents) + 1, 99)
+        else:
+            condition, target = MarketCondition.LE, rng.randint(1, math.floor(cents) - 1)
+        yield {
+            "user_id": i // per_user + 1,
+            "market_id": catalog.market_id(index),
+            "token_id": token_id,
+            "market_url": "https://polymarket.com/event/synthetic-event-0",
+            "market_title": f"Will synthetic outcome #{catalog.market_id(index)} happen?",
+            "target_price": target,
+            "condition": condition,
+            "is_active": True,
+        }
+
+
+async def _seed(engine, scale: int, per_user: int, tokens: int, trigger_rate: float):
+    from src.infrastructure.db.models.base import Base
+    from src.infrastructure.db.models.market import Market
+    from src.infrastructure.db.models.user import User
+
+    users = -(-scale // per_user)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for start in range(0, users, INSERT_BATCH):
+            await conn.execute(
+                insert(User),
+                [
+                    {"id": user_id, "username": f"user{user_id}", "full_name": f"User {user_id}"}
+                    for user_id in range(start + 1, min(users, start + INSERT_BATCH) + 1)
+                ],
+            )
+        batch = []
+        for row in _subscriptions(scale, per_user, tokens, trigger_rate):
+            batch.append(row)
+            if len(batch) == INSERT_BATCH:
+                await conn.execute(insert(Market), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(Market), batch)
+    return users
+
+
+async def _run_scale(scale: int, args: argparse.Namespace, url: str) -> dict:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.bootstrap.database import create_session_maker
+    from src.infrastructure.i18n.setup import setup_i18n
+    from src.infrastructure.notifications.dispatcher import NotificationDispatcher
+    from src.infrastructure.polymarket.client import PolymarketApiClient, PoolConfig
+    from src.infrastructure.scheduler.monitoring import MarketMonitorService
+    from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+
+    tokens = _token_count(scale, args)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+
+        db = {"seconds": 0.0, "statements": 0}
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info["query_started"] = time.perf_counter()
+
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            db["seconds"] += time.perf_counter() - conn.info.pop("query_started")
+            db["statements"] += 1
+
+        started = time.perf_counter()
+        users = await _seed(engine, scale, args.per_user, tokens, args.trigger_rate)
+        seed_seconds = time.perf_counter() - started
+
+        session_maker = create_session_maker(engine)
+        api = PolymarketApiClient(clob_pool=PoolConfig(rate=args.api_rate), gamma_url=url, clob_url=url)
+        await api.start(warm_up=False)
+        timed_api = TimedApi(api)
+        bot = SinkBot()
+        dispatcher = NotificationDispatcher(bot, global_rate=1e9, per_chat_rate=1e9)
+        await dispatcher.start()
+        registry = ActiveMarketRegistry(session_maker)
+        service = MarketMonitorService(
+            session_maker=session_maker,
+            polymarket_api=timed_api,
+            notifier=dispatcher,
+            scheduler=AsyncIOScheduler(),
+            translator_hub=setup_i18n(),
+            registry=registry,
+            chunk_size=args.chunk_size,
+            fetch_concurrency=args.fetch_concurrency,
+            tick_budget_seconds=3600,
+        )
+
+        evaluation = {"seconds": 0.0, "triggered": 0}
+        collect_triggered = service._collect_triggered
+
+        def timed_collect(quotes):
+            started = time.perf_counter()
+            triggered = collect_triggered(quotes)
+            evaluation["seconds"] += time.perf_counter() - started
+            evaluation["triggered"] += len(triggered)
+            return triggered
+
+        service._collect_triggered = timed_collect
+
+        try:
+            started = time.perf_counter()
+            await registry.load()
+            load_seconds = time.perf_counter() - started
+            load_rss = _rss_mib()
+
+            ticks = []
+            for _ in range(args.ticks):
+                db.update(seconds=0.0, statements=0)
+                evaluation.update(seconds=0.0, triggered=0)
+                timed_api.requests, timed_api.busy_seconds = 0, 0.0
+                sent_before = bot.sent
+
+                started = time.perf_counter()
+                await service.check_markets()
+                wall = time.perf_counter() - started
+                while bot.sent - sent_before < evaluation["triggered"]:
+                    await asyncio.sleep(0.001)
+                delivered = time.perf_counter() - started
+
+                notifications = bot.sent - sent_before
+                ticks.append({
+                    "wall_seconds": wall,
+                    "db_seconds": db["seconds"],
+                    "db_statements": db["statements"],
+                    "api_seconds": timed_api.busy_seconds,
+                    "api_requests": timed_api.requests,
+                    "eval_seconds": evaluation["seconds"],
+                    "triggered": evaluation["triggered"],
+                    "notifications": notifications,
+                    "notifications_per_second": notifications / delivered if notifications else 0.0,
+                })
+        finally:
+            await dispatcher.stop()
+            await api.close()
+            await engine.dispose()
+
+    return {
+        "subscriptions": scale,
+        "users": users,
+        "tokens": tokens,
+        "seed_seconds": seed_seconds,
+        "load_seconds": load_seconds,
+        "load_rss_mib": load_rss,
+        "peak_rss_mib": _rss_mib(),
+        "ticks": ticks,
+    }
+
+
+def _rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_scale(scale: int, args: argparse.Namespace, url: str) -> dict:
+    logging.basicConfig(level=logging.ERROR)
+    return asyncio.run(_run_scale(scale, args, url))
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _summary(result: dict) -> dict:
+    ticks = result["ticks"]
+    steady = ticks[1:] or ticks
+    return {
+        "load": result["load_seconds"],
+        "first": ticks[0]["wall_seconds"],
+        "steady": median(t["wall_seconds"] for t in steady),
+        "rss": result["peak_rss_mib"],
+    }
+
+
+HEADER = (
+    f"{'subs':>9} {'tokens':>7} {'load s':>7} {'tick s':>7} {'db ms':>7} {'api ms':>8} "
+    f"{'eval ms':>8} {'fired':>6} {'notif/s':>8} {'steady s':>9} {'rss MiB':>8}"
+)
+
+
+def print_result(result: dict):
+    # Columns up to notif/s are for the first, triggering tick
+    first = result["ticks"][0]
+    print(
+        f"{result['subscriptions']:>9} {result['tokens']:>7} {result['load_seconds']:>7.2f} "
+        f"{first['wall_seconds']:>7.2f} {first['db_seconds'] * 1000:>7.1f} {first['api_seconds'] * 1000:>8.1f} "
+        f"{first['eval_seconds'] * 1000:>8.1f} {first['triggered']:>6} {first['notifications_per_second']:>8.0f} "
+        f"{_summary(result)['steady']:>9.2f} {result['peak_rss_mib']:>8.0f}"
+    )
+
+
+def print_comparison(results: list[dict], baseline: dict):
+    previous = {r["subscriptions"]: r for r in baseline["results"]}
+    print(f"\nvs {baseline.get('commit') or 'baseline'} (new / old)")
+    print(f"{'subs':>9} {'load':>7} {'tick':>7} {'steady':>7} {'rss':>7}")
+    for result in results:
+        old = previous.get(result["subscriptions"])
+        if old is None:
+            continue
+        new, old = _summary(result), _summary(old)
+        ratios = [new[key] / old[key] if old[key] else math.nan for key in ("load", "first", "steady", "rss")]
+        print(f"{result['subscriptions']:>9} " + " ".join(f"{ratio:>6.2f}x" for ratio in ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="1000,10000,100000,1000000", help="comma separated subscription counts")
+    parser.add_argument("--per-user", type=int, default=10, help="subscriptions per user")
+    parser.add_argument("--per-token", type=int, default=20, help="subscriptions sharing a token")
+    parser.add_argument("--trigger-rate", type=float, default=0.01, help="share of subscriptions firing on the first tick")
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--fetch-concurrency", type=int, default=5)
+    parser.add_argument("--api-rate", type=float, default=1000.0, help="CLOB requests per second")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds per response")
+    parser.add_argument("--output", default="monitor_tick.json")
+    parser.add_argument("--compare", help="earlier JSON output to compare against")
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    context = multiprocessing.get_context("spawn")
+    port = _free_port()
+    server = context.Process(target=_serve, args=(port, _token_count(max(scales), args), args.latency), daemon=True)
+    server.start()
+    results = []
+    try:
+        _wait_for_port(port)
+        print(HEADER)
+        for scale in scales:
+            # A process per scale, so peak RSS is not inherited from a larger run
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results.append(executor.submit(run_scale, scale, args, f"http://127.0.0.1:{port}").result())
+            print_result(results[-1])
+    finally:
+        server.terminate()
+        server.join()
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Decoding cost of Polymarket payloads: stdlib json into dicts vs typed msgspec structs.
+
+Uses a hand-written gamma market in benchmarks/payloads/ for /markets/{id},
+shaped like a real response (same fields, stringified JSON arrays) but with
+made-up ids and values, an event holding --event-markets copies of it for
+/events, and a synthetic /prices response for --tokens tokens. Drop in a
+recorded response to measure real payloads.
+
+Usage:
+    python -m benchmarks.payload_decoding [--rounds 2000] [--event-markets 200] [--tokens 500]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.infrastructure.polymarket import payloads
+
+FIXTURES = Path(__file__).parent / "payloads"
+
+
+def legacy_market(body: bytes) -> tuple:
+    # What get_market_info used to do: full dict, then re-parse the embedded lists
+    data = json.loads(body)
+    token_ids = json.loads(data.get("clobTokenIds", "[]"))
+    price = float(data["bestAsk"]) if data.get("bestAsk") is not None else 0.0
+    if price == 0.0:
+        outcome_prices = json.loads(data.get("outcomePrices", "[]"))
+        price = float(outcome_prices[0]) if outcome_prices else 0.0
+    return data.get("question"), data.get("slug"), token_ids[0] if token_ids else None, price
+
+
+def typed_market(body: bytes) -> tuple:
+    market = payloads.decode_market(body)
+    return market.question, market.slug, market.token_id, market.price()
+
+
+def legacy_event(body: bytes) -> list:
+    return [(m["id"], m.get("question"), m.get("active")) for m in json.loads(body)[0]["markets"] if m.get("closed") is False]
+
+
+def typed_event(body: bytes) -> list:
+    return [(m.id, m.question, m.active) for m in payloads.decode_events(body)[0].markets if m.closed is False]
+
+
+def legacy_prices(body: bytes) -> dict:
+    return {tid: float(q["SELL"]) for tid, q in json.loads(body).items() if q.get("SELL")}
+
+
+def typed_prices(body: bytes) -> dict:
+    return {tid: float(q.sell) for tid, q in payloads.decode_prices(body).items() if q.sell}
+
+
+def measure(fn, body: bytes, rounds: int) -> tuple[float, int]:
+    fn(body)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(body)
+    per_call = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--event-markets", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=500)
+    args = parser.parse_args()
+
+    market_body = (FIXTURES / "synthetic_gamma_market.json").read_bytes()
+    market = json.loads(market_body)
+    event_body = json.dumps(
+        [{"id": "27824", "slug": "bench", "markets": [dict(market, id=str(i)) for i in range(args.event_markets)]}]
+    ).encode()
+    prices_body = json.dumps(
+        {f"{i:077d}": {"SELL": f"0.{i % 1000:03d}", "BUY": "0.5"} for i in range(args.tokens)}
+    ).encode()
+
+    cases = [
+        (f"/markets/{{id}} ({len(market_body)} B)", market_body, legacy_market, typed_market, args.rounds),
+        (f"/events, {args.event_markets} markets ({len(event_body) // 1024} KiB)", event_body, legacy_event, typed_event, max(args.rounds // 100, 10)),
+        (f"/prices, {args.tokens} tokens ({len(prices_body) // 1024} KiB)", prices_body, legacy_prices, typed_prices, max(args.rounds // 10, 10)),
+    ]
+
+    print(f"{'payload':<40} {'json us':>10} {'typed us':>10} {'speedup':>8} {'json peak':>11} {'typed peak':>11}")
+    for name, body, legacy, typed, rounds in cases:
+        assert legacy(body) == typed(body), name
+        legacy_time, legacy_peak = measure(legacy, body, rounds)
+        typed_time, typed_peak = measure(typed, body, rounds)
+        print(
+            f"{name:<40} {legacy_time * 1e6:>10.1f} {typed_time * 1e6:>10.1f} "
+            f"{legacy_time / typed_time:>7.1f}x {legacy_peak // 1024:>8} KiB {typed_peak // 1024:>7} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Drive the Polymarket client through healthy, failing, throttled and recovered
+phases of the local fake server and report what reached upstream.
+
+Usage:
+    python -m benchmarks.resilience [--calls 40] [--recovery 1.0]
+"""
+import argparse
+import asyncio
+import logging
+
+from aiohttp import web
+
+from src.domain.exceptions import MarketApiError, PolymarketUnavailableError
+from src.infrastructure.polymarket.client import PolymarketApiClient, PoolConfig
+from src.infrastructure.polymarket.fake_server import FAULTS_KEY, Faults, create_app
+from src.infrastructure.polymarket.resilience import RetryPolicy
+
+PHASES = [
+    ("healthy", Faults()),
+    ("throttled", Faults(throttle_rate=0.5, retry_after=0.05)),
+    ("outage", Faults(error_rate=1.0)),
+    ("recovered", Faults()),
+]
+
+
+async def run_phase(client: PolymarketApiClient, calls: int) -> dict[str, int]:
+    outcome = {"ok": 0, "failed": 0, "short_circuited": 0}
+    for i in range(calls):
+        try:
+            await client.get_prices_batch([f"token-{i}"])
+            outcome["ok"] += 1
+        except PolymarketUnavailableError:
+            outcome["short_circuited"] += 1
+        except MarketApiError:
+            outcome["failed"] += 1
+    return outcome
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--recovery", type=float, default=1.0, help="breaker recovery seconds")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    received = {"count": 0}
+
+    @web.middleware
+    async def count_requests(request, handler):
+        received["count"] += 1
+        return await handler(request)
+
+    app = create_app(interval=3600)
+    app.middlewares.insert(0, count_requests)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    client = PolymarketApiClient(
+        clob_pool=PoolConfig(rate=200),
+        retry=RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.5),
+        breaker_threshold=5,
+        breaker_recovery_seconds=args.recovery,
+        clob_url=f"http://127.0.0.1:{port}",
+    )
+    breaker = client.breakers["clob"]
+
+    print(f"{'phase':<10} {'ok':>4} {'failed':>7} {'short':>6} {'upstream':>9} {'breaker':>10}")
+    try:
+        for name, faults in PHASES:
+            # The app is frozen once started, so update its faults in place
+            vars(app[FAULTS_KEY]).update(vars(faults))
+            if name == "recovered":
+                # Let the breaker reach half-open so the probe can close it
+                await asyncio.sleep(args.recovery)
+            before = received["count"]
+            outcome = await run_phase(client, args.calls)
+            print(
+                f"{name:<10} {outcome['ok']:>4} {outcome['failed']:>7} {outcome['short_circuited']:>6} "
+                f"{received['count'] - before:>9} {breaker.state.value:>10}"
+            )
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,290 @@
+"""
+Multi-process check of monitor sharding and registry broadcasting over Redis.
+
+Seeds a temporary SQLite database and starts --workers monitor processes, each
+with its own ActiveMarketRegistry, ShardCoordinator and RegistryBroadcast, as
+main.py wires them. No reconciliation is scheduled, so every change a
+worker sees must have come through Redis. Checks that:
+
+- the tokens are split between the workers, each owned exactly once;
+- a market re-enabled or deleted through the use cases in one worker, as in
+  the process polling Telegram, reaches every other worker's registry;
+- when a worker dies, its tokens move to the survivors once its lease
+  expires, and no other token moves;
+- when a worker joins, it takes a share of the tokens and again only those move.
+
+Exits non-zero if any check fails. Without --redis-url a fakeredis TCP server
+is started in-process (pip install fakeredis).
+
+Usage:
+    python -m benchmarks.sharding [--workers 3] [--tokens 300] [--markets 3000]
+    python -m benchmarks.sharding --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert
+
+LEASE_SECONDS = 2.0
+PROPAGATION_TIMEOUT = 2.0
+
+
+def worker(worker_id: str, database_url: str, redis_url: str, commands: multiprocessing.Queue, replies: multiprocessing.Queue):
+    asyncio.run(_worker(worker_id, database_url, redis_url, commands, replies))
+
+
+async def _worker(worker_id, database_url, redis_url, commands, replies):
+    from redis.asyncio import Redis
+
+    from src.bootstrap.database import create_engine, create_session_maker
+    from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+    from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+    from src.infrastructure.sharding.broadcast import RegistryBroadcast
+    from src.infrastructure.sharding.coordinator import ShardCoordinator
+    from src.use_cases.market.delete import DeleteMarketUseCase
+    from src.use_cases.market.toggle_monitoring import ToggleMonitoringUseCase
+
+    engine = create_engine(database_url)
+    session_maker = create_session_maker(engine)
+    redis = Redis.from_url(redis_url)
+    registry = ActiveMarketRegistry(session_maker)
+    shard = ShardCoordinator(redis, worker_id=worker_id, lease_seconds=LEASE_SECONDS, heartbeat_seconds=LEASE_SECONDS / 4)
+    broadcast = RegistryBroadcast(redis, registry, worker_id)
+    await broadcast.start()
+    await registry.load()
+    await shard.start()
+    replies.put(("ready", worker_id))
+
+    while True:
+        command, *args = await asyncio.to_thread(commands.get)
+        if command == "stop":
+            break
+        if command == "report":
+            replies.put((worker_id, {
+                "owned": sorted(shard.filter(registry.index.token_ids)),
+                "members": list(shard.members),
+                "markets": len(registry.index),
+            }))
+        elif command == "has":
+            replies.put((worker_id, registry.index.get(args[0]) is not None))
+        elif command in ("enable", "delete"):
+            async with session_maker() as session:
+                repo = SQLAlchemyMarketRepository(session)
+                if command == "enable":
+                    await ToggleMonitoringUseCase(repo, broadcast)(args[0], is_active=True)
+                else:
+                    await DeleteMarketUseCase(repo, broadcast)(args[0])
+            replies.put((worker_id, True))
+
+    await shard.stop()
+    await broadcast.stop()
+    await redis.aclose()
+    await engine.dispose()
+
+
+class Cluster:
+    def __init__(self, database_url: str, redis_url: str):
+        self.database_url = database_url
+        self.redis_url = redis_url
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: dict[str, multiprocessing.Process] = {}
+        self.commands: dict[str, multiprocessing.Queue] = {}
+        self.replies: dict[str, multiprocessing.Queue] = {}
+
+    def start(self, worker_id: str):
+        commands, replies = self.context.Queue(), self.context.Queue()
+        process = self.context.Process(
+            target=worker, args=(worker_id, self.database_url, self.redis_url, commands, replies), daemon=True
+        )
+        process.start()
+        self.processes[worker_id], self.commands[worker_id], self.replies[worker_id] = process, commands, replies
+        ready = replies.get(timeout=60)
+        assert ready == ("ready", worker_id), ready
+
+    def ask(self, worker_id: str, *command):
+        self.commands[worker_id].put(command)
+        return self.replies[worker_id].get(timeout=30)[1]
+
+    def kill(self, worker_id: str):
+        # No graceful exit: the lease has to expire
+        self.processes.pop(worker_id).kill()
+        self.commands.pop(worker_id)
+        self.replies.pop(worker_id)
+
+    def stop(self):
+        for worker_id, process in self.processes.items():
+            self.commands[worker_id].put(("stop",))
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+
+    def reports(self) -> dict[str, dict]:
+        return {worker_id: self.ask(worker_id, "report") for worker_id in self.processes}
+
+    def wait_for(self, predicate, timeout: float) -> float | None:
+        """Seconds until `predicate()` held, None if it did not within `timeout`."""
+        started = time.monotonic()
+        while time.monotonic() - started < timeout:
+            if predicate():
+                return time.monotonic() - started
+            time.sleep(0.05)
+        return None
+
+
+def took(waited: float | None) -> str:
+    return f"{waited * 1000:.0f} ms" if waited is not None else f"not within {PROPAGATION_TIMEOUT:.0f}s"
+
+
+def ownership(reports: dict[str, dict]) -> dict[str, str]:
+    owners = {}
+    for worker_id, report in reports.items():
+        for token in report["owned"]:
+            owners.setdefault(token, worker_id)
+    return owners
+
+
+def split_ok(reports: dict[str, dict], tokens: set[str]) -> bool:
+    owned = [t for report in reports.values() for t in report["owned"]]
+    return (
+        len(owned) == len(set(owned)) == len(tokens)
+        and set(owned) == tokens
+        and all(report["owned"] for report in reports.values())
+        and all(report["members"] == sorted(reports) for report in reports.values())
+    )
+
+
+async def seed(database_url: str, markets: int, tokens: int):
+    from src.bootstrap.database import create_engine
+    from src.infrastructure.db.models.base import Base
+    from src.infrastructure.db.models.market import Market, MarketCondition
+    from src.infrastructure.db.models.user import User
+
+    engine = create_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": 1, "full_name": "Sharding"}])
+        await conn.execute(
+            insert(Market),
+            [
+                {
+                    "id": i,
+                    "user_id": 1,
+                    "market_id": str(i),
+                    # The last market sits alone on a token and starts paused
+                    "token_id": f"token-{i % tokens}" if i < markets else "token-paused",
+                    "market_url": "https://polymarket.com/event/sharding",
+                    "target_price": 50,
+                    "condition": MarketCondition.GE,
+                    "is_active": i < markets,
+                }
+                for i in range(1, markets + 1)
+            ],
+        )
+    await engine.dispose()
+
+
+def start_fake_redis() -> str:
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        sys.exit("fakeredis is not installed: pip install fakeredis, or pass --redis-url")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = TcpFakeServer(("127.0.0.1", port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"redis://127.0.0.1:{port}/0"
+
+
+def run(args: argparse.Namespace) -> bool:
+    redis_url = args.redis_url or start_fake_redis()
+    ok = True
+
+    def check(name: str, passed: bool, detail: str = ""):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{name:<44} {'ok' if passed else 'FAIL'}  {detail}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'sharding.sqlite3')}"
+        asyncio.run(seed(database_url, args.markets, args.tokens))
+        tokens = {f"token-{i}" for i in range(args.tokens)}
+        paused_market = args.markets
+
+        cluster = Cluster(database_url, redis_url)
+        try:
+            worker_ids = [f"worker-{i}" for i in range(args.workers)]
+            for worker_id in worker_ids:
+                cluster.start(worker_id)
+
+            waited = cluster.wait_for(lambda: split_ok(cluster.reports(), tokens), LEASE_SECONDS * 3)
+            reports = cluster.reports()
+            shares = ", ".join(str(len(r["owned"])) for r in reports.values())
+            check("tokens split, each owned once", waited is not None, f"shares {shares}")
+
+            # worker-0 stands in for the process polling Telegram
+            bot, others = worker_ids[0], worker_ids[1:]
+            cluster.ask(bot, "enable", paused_market)
+            waited = cluster.wait_for(
+                lambda: all(cluster.ask(w, "has", paused_market) for w in others), PROPAGATION_TIMEOUT
+            )
+            check("re-enabled market reaches every worker", waited is not None, took(waited))
+            owners = [w for w, r in cluster.reports().items() if "token-paused" in r["owned"]]
+            check("its new token has exactly one owner", len(owners) == 1, f"{owners}")
+
+            cluster.ask(bot, "delete", paused_market)
+            waited = cluster.wait_for(
+                lambda: not any(cluster.ask(w, "has", paused_market) for w in others), PROPAGATION_TIMEOUT
+            )
+            check("deleted market leaves every worker", waited is not None, took(waited))
+
+            before = ownership(cluster.reports())
+            victim = worker_ids[-1]
+            cluster.kill(victim)
+            waited = cluster.wait_for(lambda: split_ok(cluster.reports(), tokens), LEASE_SECONDS * 4)
+            after = ownership(cluster.reports())
+            moved = {t for t in tokens if before.get(t) != after.get(t)}
+            victim_tokens = {t for t, w in before.items() if w == victim}
+            check(
+                "dead worker's tokens taken over",
+                waited is not None and moved == victim_tokens,
+                f"{len(moved)} moved in {(waited or 0):.1f}s",
+            )
+
+            before = after
+            cluster.start("worker-new")
+            waited = cluster.wait_for(lambda: split_ok(cluster.reports(), tokens), LEASE_SECONDS * 3)
+            after = ownership(cluster.reports())
+            moved = {t for t in tokens if before.get(t) != after.get(t)}
+            check(
+                "joining worker takes only its share",
+                waited is not None and all(after[t] == "worker-new" for t in moved),
+                f"{len(moved)} of {len(tokens)} moved",
+            )
+        except queue.Empty:
+            check("workers answered", False, "a worker stopped responding")
+        finally:
+            cluster.stop()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--markets", type=int, default=3_000)
+    parser.add_argument("--redis-url", help="Redis to coordinate through, an in-process fakeredis server by default")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Mixed read/write throughput of the SQLite database with and without the tuned profile.
+
+Concurrent handler tasks each open a session per operation, like the DB
+middleware does, and mostly list a user's markets (reads) or change a target
+price (writes), while a monitor task deactivates triggered markets in bulk.
+Reports operations per second, p50/p99 handler
+latency and "database is locked" errors for the default engine and for the
+SQLiteProfile from bootstrap/database.py.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--seconds 10] [--handlers 20] [--write-share 0.2]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.bootstrap.database import SQLiteProfile, create_engine, create_session_maker
+from src.domain.entities.market import MarketCondition
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.market import Market
+from src.infrastructure.db.models.user import User
+from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+
+USERS = 5_000
+MARKETS = 50_000
+
+
+async def seed(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": i, "full_name": f"User {i}"} for i in range(1, USERS + 1)])
+        await conn.execute(
+            insert(Market),
+            [
+                {
+                    "user_id": i % USERS + 1,
+                    "market_id": str(i),
+                    "token_id": f"token-{i % 2_500}",
+                    "market_url": "https://polymarket.com/event/bench",
+                    "target_price": 50,
+                    "condition": MarketCondition.GE,
+                    "is_active": True,
+                }
+                for i in range(MARKETS)
+            ],
+        )
+
+
+def percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(name: str, engine, args: argparse.Namespace) -> dict:
+    await seed(engine)
+    session_maker = create_session_maker(engine)
+    latencies = {"read": [], "write": []}
+    locked = 0
+    deadline = time.monotonic() + args.seconds
+
+    async def handler(seed: int):
+        nonlocal locked
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            kind = "write" if rng.random() < args.write_share else "read"
+            started = time.perf_counter()
+            try:
+                async with session_maker() as session:
+                    repo = SQLAlchemyMarketRepository(session)
+                    if kind == "read":
+                        await repo.get_markets_by_user(rng.randint(1, USERS))
+                    else:
+                        await repo.update_target_price(rng.randint(1, MARKETS), rng.randint(1, 99), MarketCondition.GE)
+            except OperationalError:
+                locked += 1
+                continue
+            latencies[kind].append(time.perf_counter() - started)
+
+    async def monitor():
+        nonlocal locked
+        rng = random.Random(0)
+        while time.monotonic() < deadline:
+            try:
+                async with session_maker() as session:
+                    repo = SQLAlchemyMarketRepository(session)
+                    await repo.deactivate_markets(rng.sample(range(1, MARKETS + 1), 200))
+            except OperationalError:
+                locked += 1
+            await asyncio.sleep(0.2)
+
+    started = time.monotonic()
+    await asyncio.gather(monitor(), *(handler(i) for i in range(args.handlers)))
+    elapsed = time.monotonic() - started
+    await engine.dispose()
+
+    every = latencies["read"] + latencies["write"]
+    return {
+        "name": name,
+        "ops": len(every) / elapsed,
+        "reads": len(latencies["read"]) / elapsed,
+        "writes": len(latencies["write"]) / elapsed,
+        "p50": percentile(every, 0.5),
+        "p99": percentile(every, 0.99),
+        "write_p99": percentile(latencies["write"], 0.99),
+        "locked": locked,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--handlers", type=int, default=20)
+    parser.add_argument("--write-share", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'engine':<10} {'ops/s':>8} {'reads/s':>8} {'writes/s':>9} {'p50 ms':>7} {'p99 ms':>7} {'write p99':>10} {'locked':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = [
+            ("default", lambda url: create_async_engine(url)),
+            ("profile", lambda url: create_engine(url, SQLiteProfile())),
+        ]
+        for name, factory in modes:
+            url = f"sqlite+aiosqlite:///{os.path.join(tmp, f'{name}.sqlite3')}"
+            result = await run(name, factory(url), args)
+            print(
+                f"{name:<10} {result['ops']:>8.0f} {result['reads']:>8.0f} {result['writes']:>9.0f} "
+                f"{result['p50'] * 1000:>7.1f} {result['p99'] * 1000:>7.1f} {result['write_p99'] * 1000:>10.1f} {result['locked']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Trigger evaluation benchmark for ThresholdIndex.
+
+Evaluates a fixed batch of fetched prices against a growing number of active
+subscriptions and compares it with the previous linear scan over all markets.
+
+Usage:
+    python -m benchmarks.threshold_index
+"""
+import random
+import time
+
+from src.domain.entities.market import ActiveMarketDTO, MarketCondition, QuoteDTO
+from src.infrastructure.scheduler.threshold_index import ThresholdIndex
+
+SCALES = (1_000, 10_000, 100_000, 1_000_000)
+TOKENS = 5_000
+PRICES_PER_TICK = 1_000
+LINEAR_SCAN_LIMIT = 100_000
+
+
+def make_markets(count: int, base_prices: list[float], rng: random.Random) -> list[ActiveMarketDTO]:
+    markets = []
+    for i in range(count):
+        token = rng.randrange(TOKENS)
+        target_price = rng.randint(1, 99)
+        # Same rule as AddMarketUseCase: targets above the price wait for GE.
+        condition = MarketCondition.GE if target_price > base_prices[token] * 100 else MarketCondition.LE
+        markets.append(
+            ActiveMarketDTO(
+                id=i,
+                user_id=i % 10_000,
+                token_id=f"token-{token}",
+                target_price=target_price,
+                condition=condition,
+            )
+        )
+    return markets
+
+
+def linear_scan(markets: list[ActiveMarketDTO], prices: dict[str, float]) -> int:
+    fired = 0
+    for market in markets:
+        if market.token_id not in prices:
+            continue
+        current_price = prices[market.token_id] * 100
+        if market.condition == MarketCondition.LE and current_price <= market.target_price:
+            fired += 1
+        elif market.condition == MarketCondition.GE and current_price >= market.target_price:
+            fired += 1
+    return fired
+
+
+def main():
+    rng = random.Random(42)
+    base_prices = [rng.uniform(0.05, 0.95) for _ in range(TOKENS)]
+    # Each tick moves the fetched tokens by up to one point, so only the
+    # subscriptions sitting right at the current price fire.
+    prices = {
+        f"token-{t}": base_prices[t] + rng.uniform(-0.01, 0.01)
+        for t in rng.sample(range(TOKENS), PRICES_PER_TICK)
+    }
+
+    print(f"{'subscriptions':>14} {'index ms':>10} {'scan ms':>10} {'fired':>8}")
+    for scale in SCALES:
+        markets = make_markets(scale, base_prices, rng)
+        index = ThresholdIndex()
+        for market in markets:
+            index.add(market)
+
+        quotes = {token: QuoteDTO(ask=price) for token, price in prices.items()}
+        started = time.perf_counter()
+        fired = sum(len(index.triggered(token, quote)) for token, quote in quotes.items())
+        index_ms = (time.perf_counter() - started) * 1000
+
+        scan_ms = float("nan")
+        if scale <= LINEAR_SCAN_LIMIT:
+            started = time.perf_counter()
+            linear_scan(markets, prices)
+            scan_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{scale:>14,} {index_ms:>10.2f} {scan_ms:>10.2f} {fired:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,72 @@ from pydantic import SecretStr
 class Settings(BaseSettings):
     bot_token: SecretStr
     database_url: str = "sqlite+aiosqlite:///db.sqlite3"
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268_435_456
+    sqlite_cache_size: int = -65_536
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_pool_size: int = 5
+    postgres_pool_size: int = 10
+    postgres_max_overflow: int = 10
+    postgres_pool_timeout: float = 30.0
+    postgres_pool_recycle: int = 1800
+    postgres_command_timeout: float = 30.0
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: SecretStr | None = None
+    polymarket_gamma_url: str | None = None
+    polymarket_clob_url: str | None = None
+    polymarket_pool_limit: int = 100
+    polymarket_gamma_limit_per_host: int = 20
+    polymarket_clob_limit_per_host: int = 20
+    polymarket_dns_cache_seconds: int = 300
+    polymarket_keepalive_seconds: float = 30.0
+    polymarket_connect_timeout: float = 5.0
+    polymarket_gamma_timeout: float = 10.0
+    polymarket_clob_timeout: float = 15.0
+    polymarket_gamma_rate: float = 10.0
+    polymarket_clob_rate: float = 20.0
+    polymarket_retry_attempts: int = 3
+    polymarket_retry_base_delay: float = 0.5
+    polymarket_retry_max_delay: float = 10.0
+    polymarket_breaker_threshold: int = 5
+    polymarket_breaker_recovery_seconds: float = 30.0
+    market_cache_size: int = 10_000
+    market_cache_metadata_ttl: float = 3600.0
+    market_cache_price_ttl: float = 5.0
+    event_cache_ttl: float = 60.0
+    event_cache_max_stale: float = 3600.0
+    event_cache_max_markets: int = 50_000
+    user_profile_cache: bool = True
+    user_profile_cache_redis: bool = False
+    user_profile_cache_size: int = 100_000
+    user_profile_cache_ttl: int = 86_400
+    user_profile_flush_seconds: float = 5.0
+    metrics_enabled: bool = True
+    metrics_host: str = "0.0.0.0"
+    metrics_port: int = 9090
+    monitor_interval_seconds: int = 60
+    monitor_tick_jitter_seconds: int = 2
+    monitor_tick_budget_seconds: float = 45.0
+    monitor_adaptive_cadence: bool = False
+    monitor_only: bool = False
+    monitor_sharding: bool = False
+    monitor_worker_id: str | None = None
+    monitor_shard_lease_seconds: float = 15.0
+    monitor_chunk_size: int = 20
+    monitor_fetch_concurrency: int = 5
+    monitor_streaming: bool = False
+    monitor_stream_stale_seconds: float = 60.0
+    monitor_reconcile_seconds: int = 300
+    polymarket_ws_url: str | None = None
+    notify_workers: int = 4
+    notify_global_rate: float = 30.0
+    notify_per_chat_rate: float = 1.0
+    notify_drain_seconds: float = 5.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
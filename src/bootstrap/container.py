@@ -0,0 +1,147 @@
+import time
+from functools import cached_property, wraps
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.protocols.market_events import MarketEventPublisher
+from src.domain.protocols.polymarket import PolymarketAPI
+from src.domain.protocols.repositories.user import UserRepository
+from src.infrastructure import metrics
+from src.infrastructure.db.repositories.cached_user import CachedUserRepository, UserProfileCache
+from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+from src.infrastructure.db.repositories.user import SQLAlchemyUserRepository
+from src.use_cases.market.add import AddMarketUseCase
+from src.use_cases.market.check_exists import CheckMarketExistsUseCase
+from src.use_cases.market.delete import DeleteMarketUseCase
+from src.use_cases.market.get import GetMarketUseCase
+from src.use_cases.market.get_event_markets import GetEventMarketsUseCase
+from src.use_cases.market.list import ListUserMarketsUseCase
+from src.use_cases.market.set_price_source import SetPriceSourceUseCase
+from src.use_cases.market.toggle_monitoring import ToggleMonitoringUseCase
+from src.use_cases.market.update import UpdateMarketUseCase
+from src.use_cases.user.create import CreateUserUseCase
+
+
+def provide(factory):
+    """`cached_property` adding its construction time to the container's `build_seconds`."""
+
+    @wraps(factory)
+    def build(self: "UseCaseContainer"):
+        # Use cases build their repositories, count the outermost call only
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            return factory(self)
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.build_seconds += time.perf_counter() - started
+
+    return cached_property(build)
+
+
+class UseCaseContainer:
+    """
+    Dependencies of a single update, built on first access.
+
+    The session is only created when a repository asks for it, so updates
+    whose handler needs no database never touch the pool. `close` ends the
+    scope and must be called once the update is handled.
+    """
+
+    # Use cases handlers can request by parameter name
+    USE_CASES = frozenset({
+        "create_user_use_case",
+        "add_market_use_case",
+        "list_markets_use_case",
+        "update_market_use_case",
+        "delete_market_use_case",
+        "get_market_use_case",
+        "check_market_exists_use_case",
+        "get_event_markets_use_case",
+        "toggle_monitoring_use_case",
+        "set_price_source_use_case",
+    })
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        polymarket_api: PolymarketAPI,
+        market_registry: MarketEventPublisher,
+        user_profile_cache: UserProfileCache | None = None,
+    ):
+        self.session_maker = session_maker
+        self.polymarket_api = polymarket_api
+        self.market_registry = market_registry
+        self.user_profile_cache = user_profile_cache
+        self._session: AsyncSession | None = None
+        self._depth = 0
+        # Time spent constructing dependencies, observed when the scope closes
+        self.build_seconds = 0.0
+
+    @property
+    def session_opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.session_maker()
+            metrics.UPDATE_DB_SESSIONS.inc()
+        return self._session
+
+    async def close(self):
+        metrics.UPDATE_DEPENDENCY_SECONDS.observe(self.build_seconds)
+        if self._session is not None:
+            await self._session.close()
+
+    @provide
+    def user_repo(self) -> UserRepository:
+        if self.user_profile_cache is None:
+            return SQLAlchemyUserRepository(self.session)
+        # Unchanged users are answered from the cache without a session
+        return CachedUserRepository(self.user_profile_cache, lambda: SQLAlchemyUserRepository(self.session))
+
+    @provide
+    def market_repo(self) -> SQLAlchemyMarketRepository:
+        return SQLAlchemyMarketRepository(self.session)
+
+    @provide
+    def create_user_use_case(self) -> CreateUserUseCase:
+        return CreateUserUseCase(self.user_repo)
+
+    @provide
+    def add_market_use_case(self) -> AddMarketUseCase:
+        return AddMarketUseCase(self.market_repo, self.polymarket_api, self.market_registry)
+
+    @provide
+    def list_markets_use_case(self) -> ListUserMarketsUseCase:
+        return ListUserMarketsUseCase(self.market_repo)
+
+    @provide
+    def update_market_use_case(self) -> UpdateMarketUseCase:
+        return UpdateMarketUseCase(self.market_repo, self.polymarket_api, self.market_registry)
+
+    @provide
+    def delete_market_use_case(self) -> DeleteMarketUseCase:
+        return DeleteMarketUseCase(self.market_repo, self.market_registry)
+
+    @provide
+    def get_market_use_case(self) -> GetMarketUseCase:
+        return GetMarketUseCase(self.market_repo)
+
+    @provide
+    def check_market_exists_use_case(self) -> CheckMarketExistsUseCase:
+        return CheckMarketExistsUseCase(self.market_repo)
+
+    @provide
+    def get_event_markets_use_case(self) -> GetEventMarketsUseCase:
+        return GetEventMarketsUseCase(self.polymarket_api)
+
+    @provide
+    def toggle_monitoring_use_case(self) -> ToggleMonitoringUseCase:
+        return ToggleMonitoringUseCase(self.market_repo, self.market_registry)
+
+    @provide
+    def set_price_source_use_case(self) -> SetPriceSourceUseCase:
+        return SetPriceSourceUseCase(self.market_repo, self.market_registry)
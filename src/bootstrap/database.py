@@ -1,13 +1,118 @@
+from dataclasses import asdict, dataclass
 from typing import AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from .config import get_settings
 
+
+@dataclass
+class SQLiteProfile:
+    """PRAGMAs applied to every new SQLite connection."""
+    # Readers no longer block the writer and vice versa
+    journal_mode: str = "WAL"
+    # In WAL mode NORMAL only fsyncs at checkpoints and is still corruption-safe
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    # Negative values are KiB rather than pages
+    cache_size: int = -64 * 1024
+    temp_store: str = "MEMORY"
+    # Milliseconds a connection waits for a lock before failing with "database is locked"
+    busy_timeout: int = 5000
+
+
+@dataclass
+class PostgresPool:
+    pool_size: int = 10
+    max_overflow: int = 10
+    # Seconds to wait for a free connection before failing
+    pool_timeout: float = 30.0
+    # Reconnect before proxies and load balancers drop idle connections
+    pool_recycle: int = 1800
+    # Seconds a single statement may run
+    command_timeout: float = 30.0
+
+
+def database_url(url: str) -> URL:
+    """Parse `url`, picking the async driver for a bare postgresql:// URL."""
+    url = make_url(url)
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def apply_sqlite_profile(engine: AsyncEngine, profile: SQLiteProfile):
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in asdict(profile).items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_engine(
+    url: str,
+    sqlite_profile: SQLiteProfile | None = None,
+    sqlite_pool_size: int = 5,
+    postgres_pool: PostgresPool | None = None,
+) -> AsyncEngine:
+    url = database_url(url)
+    if url.get_backend_name() == "postgresql":
+        postgres_pool = postgres_pool or PostgresPool()
+        return create_async_engine(
+            url,
+            echo=False,
+            pool_size=postgres_pool.pool_size,
+            max_overflow=postgres_pool.max_overflow,
+            pool_timeout=postgres_pool.pool_timeout,
+            pool_recycle=postgres_pool.pool_recycle,
+            # Connections are reused for long; drop ones the server closed after a restart
+            pool_pre_ping=True,
+            connect_args={
+                "command_timeout": postgres_pool.command_timeout,
+                "server_settings": {"application_name": "polynotification"},
+            },
+        )
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, echo=False)
+
+    if url.database in (None, "", ":memory:"):
+        # Every connection would get its own empty in-memory database
+        engine = create_async_engine(url, echo=False, poolclass=StaticPool)
+    else:
+        # Keep connections open: PRAGMAs and the page cache live per connection
+        engine = create_async_engine(url, echo=False, poolclass=AsyncAdaptedQueuePool, pool_size=sqlite_pool_size)
+    if sqlite_profile:
+        apply_sqlite_profile(engine, sqlite_profile)
+    return engine
+
+
 def create_engine_factory() -> AsyncEngine:
     settings = get_settings()
-    return create_async_engine(
+    profile = None
+    if settings.sqlite_tuning:
+        profile = SQLiteProfile(
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            mmap_size=settings.sqlite_mmap_size,
+            cache_size=settings.sqlite_cache_size,
+            temp_store=settings.sqlite_temp_store,
+            busy_timeout=settings.sqlite_busy_timeout_ms,
+        )
+    postgres_pool = PostgresPool(
+        pool_size=settings.postgres_pool_size,
+        max_overflow=settings.postgres_max_overflow,
+        pool_timeout=settings.postgres_pool_timeout,
+        pool_recycle=settings.postgres_pool_recycle,
+        command_timeout=settings.postgres_command_timeout,
+    )
+    return create_engine(
         settings.database_url,
-        echo=False,
+        profile,
+        sqlite_pool_size=settings.sqlite_pool_size,
+        postgres_pool=postgres_pool,
     )
 
 def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -6,6 +6,41 @@ class MarketCondition(str, enum.Enum):
     LE = "le"  # Less or Equal
     GE = "ge"  # Greater or Equal
 
+class PriceSource(str, enum.Enum):
+    ASK = "ask"  # Best ask, what buying Yes costs right now
+    BID = "bid"  # Best bid
+    MID = "mid"  # Midpoint of best bid and best ask
+
+@dataclass
+class QuoteDTO:
+    bid: float | None = None  # 0.0-1.0
+    ask: float | None = None  # 0.0-1.0
+
+    @property
+    def mid(self) -> float | None:
+        if self.bid is None or self.ask is None:
+            return None
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread(self) -> float | None:
+        if self.bid is None or self.ask is None:
+            return None
+        return self.ask - self.bid
+
+    def price(self, source: PriceSource) -> float | None:
+        if source == PriceSource.ASK:
+            return self.ask
+        if source == PriceSource.BID:
+            return self.bid
+        return self.mid
+
+    @property
+    def reference(self) -> float | None:
+        """Best single price for the quote: the midpoint, or whichever side exists."""
+        mid = self.mid
+        return mid if mid is not None else (self.ask if self.ask is not None else self.bid)
+
 @dataclass
 class MarketDTO:
     id: int | None
@@ -18,11 +53,33 @@ class MarketDTO:
     condition: MarketCondition
     is_active: bool
     created_at: datetime | None
+    price_source: PriceSource = PriceSource.ASK
 
     @property
     def status_icon(self) -> str:
         return "✅" if self.is_active else "⏸️"
 
+@dataclass(slots=True)
+class ActiveMarketDTO:
+    """What the monitor keeps in memory per active market; title and URL are loaded when it fires."""
+    id: int
+    user_id: int
+    token_id: str
+    target_price: int  # 0-100
+    condition: MarketCondition
+    price_source: PriceSource = PriceSource.ASK
+
+    @classmethod
+    def from_market(cls, market: MarketDTO) -> "ActiveMarketDTO":
+        return cls(
+            id=market.id,
+            user_id=market.user_id,
+            token_id=market.token_id,
+            target_price=market.target_price,
+            condition=market.condition,
+            price_source=market.price_source,
+        )
+
 @dataclass
 class MarketInfoDTO:
     title: str
@@ -30,9 +87,17 @@ class MarketInfoDTO:
     market_id: str
     token_id: str | None = None
     slug: str | None = None
+    closed: bool = False
+    end_date: datetime | None = None
 
 @dataclass
 class MarketOptionDTO:
     id: str
     question: str
     active: bool
+
+@dataclass
+class EventMarketsDTO:
+    markets: list[MarketOptionDTO] | None  # None when the event has not been modified
+    etag: str | None = None
+    last_modified: str | None = None
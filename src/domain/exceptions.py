@@ -30,12 +30,27 @@ class MarketAlreadyExistsError(ApplicationException):
         super().__init__("You are already tracking this market.")
 
 
+class UserNotFoundError(ApplicationException):
+    """Raised when a market is saved for a user the database does not have."""
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        super().__init__(f"User with ID {user_id} not found.")
+
+
 class MarketApiError(ApplicationException):
     """Raised when there is an error fetching data from Polymarket API."""
     def __init__(self, message: str):
         super().__init__(f"Polymarket API error: {message}")
 
 
+class PolymarketUnavailableError(MarketApiError):
+    """Raised without calling Polymarket while its circuit breaker is open."""
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"{host} is unavailable, retrying in {retry_in:.0f}s")
+
+
 class TokenIdNotFoundError(ApplicationException):
     """Raised when the token ID for the 'Yes' outcome cannot be found."""
     def __init__(self, market_id: str):
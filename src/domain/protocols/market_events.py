@@ -0,0 +1,11 @@
+from typing import Protocol
+
+from src.domain.entities.market import MarketDTO
+
+
+class MarketEventPublisher(Protocol):
+    async def market_saved(self, market: MarketDTO) -> None:
+        ...
+
+    async def market_deleted(self, market_id: int) -> None:
+        ...
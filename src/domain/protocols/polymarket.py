@@ -1,11 +1,25 @@
 from typing import Protocol
 
-from src.domain.entities.market import MarketInfoDTO, MarketOptionDTO
+from src.domain.entities.market import EventMarketsDTO, MarketInfoDTO, MarketOptionDTO, QuoteDTO
 
 
 class PolymarketAPI(Protocol):
     async def get_market_info(self, market_id: str) -> MarketInfoDTO:
         ...
 
+    async def get_markets_info_batch(self, market_ids: list[str]) -> dict[str, MarketInfoDTO]:
+        ...
+
     async def get_event_markets(self, slug: str) -> list[MarketOptionDTO]:
         ...
+
+    async def get_event_markets_conditional(
+        self, slug: str, etag: str | None = None, last_modified: str | None = None
+    ) -> EventMarketsDTO:
+        ...
+
+    async def get_prices_batch(self, token_ids: list[str]) -> dict[str, float]:
+        ...
+
+    async def get_quotes_batch(self, token_ids: list[str]) -> dict[str, QuoteDTO]:
+        ...
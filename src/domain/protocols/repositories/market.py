@@ -1,10 +1,11 @@
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
-from src.domain.entities.market import MarketDTO, MarketCondition
+from src.domain.entities.market import ActiveMarketDTO, MarketDTO, MarketCondition, PriceSource
 
 
 class MarketRepository(Protocol):
-    async def create_market(self, market: MarketDTO) -> MarketDTO:
+    async def create_market(self, market: MarketDTO) -> MarketDTO | None:
+        """Returns None if the user already tracks this market."""
         ...
 
     async def get_market_by_id(self, market_id: int) -> MarketDTO | None:
@@ -19,11 +20,26 @@ class MarketRepository(Protocol):
     async def update_target_price(self, market_id: int, target_price: int, condition: MarketCondition) -> MarketDTO | None:
         ...
 
+    async def update_price_source(self, market_id: int, price_source: PriceSource) -> MarketDTO | None:
+        ...
+
     async def delete_market(self, market_id: int) -> None:
         ...
 
     async def get_active_markets(self) -> list[MarketDTO]:
         ...
 
+    def stream_active_markets(self, batch_size: int = 1000) -> AsyncIterator[list[ActiveMarketDTO]]:
+        ...
+
+    async def get_markets_by_ids(self, market_ids: list[int]) -> list[MarketDTO]:
+        ...
+
     async def update_market_status(self, market_id: int, is_active: bool) -> MarketDTO | None:
         ...
+
+    async def deactivate_markets(self, market_ids: list[int]) -> list[int]:
+        ...
+
+    async def reactivate_markets(self, market_ids: list[int]) -> list[int]:
+        ...
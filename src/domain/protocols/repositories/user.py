@@ -10,3 +10,6 @@ class UserRepository(Protocol):
     async def get_user(self, user_id: int) -> UserDTO | None:
         ...
 
+    async def upsert_users(self, users: list[UserDTO]) -> None:
+        ...
+
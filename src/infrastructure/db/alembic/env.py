@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from src.bootstrap.config import get_settings
+from src.bootstrap.database import database_url
 from src.infrastructure.db.models.base import Base
 from src.infrastructure.db.models.user import User  # Import User model to register with metadata
 from src.infrastructure.db.models.market import Market  # Import Market model
@@ -18,7 +19,9 @@ config = context.config
 
 # Overwrite sqlalchemy.url with the one from settings
 settings = get_settings()
-config.set_main_option("sqlalchemy.url", settings.database_url)
+url = database_url(settings.database_url).render_as_string(hide_password=False)
+# The config is a ConfigParser, escape the percent signs of URL-encoded parts
+config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -21,7 +21,10 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('markets', sa.Column('condition', sa.Enum('LE', 'GE', name='marketcondition'), nullable=False))
+    condition = sa.Enum('LE', 'GE', name='marketcondition')
+    # PostgreSQL needs the enum type before the column, a no-op on SQLite
+    condition.create(op.get_bind(), checkfirst=True)
+    op.add_column('markets', sa.Column('condition', condition, nullable=False))
     op.add_column('markets', sa.Column('is_active', sa.Boolean(), nullable=False))
     # ### end Alembic commands ###
 
@@ -31,4 +34,5 @@ def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
     op.drop_column('markets', 'is_active')
     op.drop_column('markets', 'condition')
+    sa.Enum(name='marketcondition').drop(op.get_bind(), checkfirst=True)
     # ### end Alembic commands ###
@@ -0,0 +1,36 @@
+"""add price_source to markets
+
+Revision ID: 5d7e1c9a3f20
+Revises: 25b23ab423ef
+Create Date: 2026-10-17 12:04:51.220341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e1c9a3f20'
+down_revision: Union[str, Sequence[str], None] = '25b23ab423ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    price_source = sa.Enum('ASK', 'BID', 'MID', name='pricesource')
+    # PostgreSQL needs the enum type before the column, a no-op on SQLite
+    price_source.create(op.get_bind(), checkfirst=True)
+    # Existing markets keep alerting on the best ask, as before
+    op.add_column(
+        'markets',
+        sa.Column('price_source', price_source, server_default='ASK', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('markets', 'price_source')
+    sa.Enum(name='pricesource').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,47 @@
+"""add markets hot path indexes
+
+Revision ID: 8c41f2d7b9e5
+Revises: 5d7e1c9a3f20
+Create Date: 2026-10-17 15:42:10.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f2d7b9e5'
+down_revision: Union[str, Sequence[str], None] = '5d7e1c9a3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent adds could store the same market twice, keep the oldest copy
+    op.execute(
+        "DELETE FROM markets WHERE id NOT IN "
+        "(SELECT MIN(id) FROM markets GROUP BY user_id, market_id)"
+    )
+    op.create_index(
+        'uq_markets_user_id_market_id', 'markets', ['user_id', 'market_id'], unique=True
+    )
+    # user_id is the leading column of the unique index, the old index is redundant
+    op.drop_index('ix_markets_user_id', table_name='markets')
+    op.create_index(
+        'ix_markets_active_token_id',
+        'markets',
+        ['token_id'],
+        unique=False,
+        sqlite_where=sa.text('is_active = 1'),
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_markets_active_token_id', table_name='markets')
+    op.create_index('ix_markets_user_id', 'markets', ['user_id'], unique=False)
+    op.drop_index('uq_markets_user_id_market_id', table_name='markets')
@@ -1,9 +1,10 @@
 from datetime import datetime
 import enum
 
-from sqlalchemy import BigInteger, String, Integer, DateTime, func, ForeignKey, Boolean, Enum as SAEnum
+from sqlalchemy import BigInteger, String, Integer, DateTime, func, ForeignKey, Boolean, Enum as SAEnum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
+from src.domain.entities.market import PriceSource
 from .base import Base
 
 
@@ -14,9 +15,20 @@ class MarketCondition(str, enum.Enum):
 
 class Market(Base):
     __tablename__ = "markets"
+    __table_args__ = (
+        # One subscription per user and market; also serves lookups by user_id
+        Index("uq_markets_user_id_market_id", "user_id", "market_id", unique=True),
+        # The registry only ever loads active rows
+        Index(
+            "ix_markets_active_token_id",
+            "token_id",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id"), nullable=False)
     market_id: Mapped[str] = mapped_column(String, nullable=False)
     token_id: Mapped[str | None] = mapped_column(String, nullable=True)
     market_url: Mapped[str] = mapped_column(String, nullable=False)
@@ -24,4 +36,7 @@ class Market(Base):
     target_price: Mapped[int] = mapped_column(Integer, nullable=False)
     condition: Mapped[MarketCondition] = mapped_column(SAEnum(MarketCondition), default=MarketCondition.LE, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    price_source: Mapped[PriceSource] = mapped_column(
+        SAEnum(PriceSource), default=PriceSource.ASK, server_default=PriceSource.ASK.name, nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
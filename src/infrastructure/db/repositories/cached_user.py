@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Callable
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.domain.entities.user import UserDTO
+from src.domain.protocols.repositories.user import UserRepository
+from src.infrastructure import metrics
+from src.infrastructure.db.repositories.user import SQLAlchemyUserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def profile_hash(user: UserDTO) -> bytes:
+    profile = f"{user.username or ''}\x00{user.full_name}"
+    return hashlib.blake2b(profile.encode(), digest_size=16).digest()
+
+
+class UserProfileCache:
+    """
+    Hashes of the user profiles known to be stored, by user id.
+
+    Kept in a bounded in-process LRU and, with `redis`, shared between
+    workers and restarts for `redis_ttl` seconds. Users whose profile changed
+    are queued and written in one batch every `flush_seconds`.
+    """
+
+    KEY_PREFIX = "polynotification:user_profile:"
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        redis: Redis | None = None,
+        max_entries: int = 100_000,
+        redis_ttl: int = 86_400,
+        flush_seconds: float = 5.0,
+    ):
+        self.session_maker = session_maker
+        self.redis = redis
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self.flush_seconds = flush_seconds
+
+        self._known: OrderedDict[int, bytes] = OrderedDict()
+        self._pending: dict[int, UserDTO] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def lookup(self, user_id: int) -> bytes | None:
+        digest = self._known.get(user_id)
+        if digest is not None:
+            self._known.move_to_end(user_id)
+            return digest
+        if self.redis is None:
+            return None
+        try:
+            value = await self.redis.get(f"{self.KEY_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"User profile lookup in Redis failed: {e}")
+            return None
+        if value is None:
+            return None
+        digest = bytes.fromhex(value.decode() if isinstance(value, bytes) else value)
+        self._store(user_id, digest)
+        return digest
+
+    async def remember(self, users: list[UserDTO]):
+        digests = {user.id: profile_hash(user) for user in users}
+        for user_id, digest in digests.items():
+            self._store(user_id, digest)
+        if self.redis is None or not digests:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id, digest in digests.items():
+                    pipe.set(f"{self.KEY_PREFIX}{user_id}", digest.hex(), ex=self.redis_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to store {len(digests)} user profiles in Redis: {e}")
+
+    async def forget(self, user_id: int):
+        """Drop the user's hash, so their next `create_user` writes through."""
+        self._known.pop(user_id, None)
+        self._pending.pop(user_id, None)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(f"{self.KEY_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Failed to drop user profile {user_id} from Redis: {e}")
+
+    def queue(self, user: UserDTO):
+        self._pending[user.id] = user
+        # Repeated requests with the new profile are skipped while it waits;
+        # a failed flush keeps it queued, so the claim becomes true eventually
+        self._store(user.id, profile_hash(user))
+
+    async def flush(self):
+        if not self._pending:
+            return
+        users, self._pending = list(self._pending.values()), {}
+        try:
+            async with self.session_maker() as session:
+                await SQLAlchemyUserRepository(session).upsert_users(users)
+        except Exception as e:
+            logger.error(f"Failed to write {len(users)} changed user profiles: {e}")
+            # Retry with the next flush, unless the profile changed again meanwhile
+            for user in users:
+                self._pending.setdefault(user.id, user)
+            return
+        metrics.USER_PROFILES_FLUSHED.inc(len(users))
+        await self.remember(users)
+
+    def _store(self, user_id: int, digest: bytes):
+        self._known[user_id] = digest
+        self._known.move_to_end(user_id)
+        while len(self._known) > self.max_entries:
+            self._known.popitem(last=False)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"User profile flush failed: {e}")
+
+
+class CachedUserRepository(UserRepository):
+    """
+    `UserRepository` decorator skipping the upsert for unchanged profiles.
+
+    Users the cache has never seen are written through, since they may not
+    exist yet and their markets need the row. Known users whose profile
+    changed are queued for the cache's next batch. Only unknown users create
+    the wrapped repository, so its session is never opened otherwise.
+
+    For skipped and queued writes `create_user` returns the user as given,
+    not the stored row. The cache is not checked against the DB, so it can
+    vouch for a row that is gone, e.g. after a restore: saving a market then
+    raises UserNotFoundError, and the caller `forget`s the user and creates
+    it again.
+    """
+
+    def __init__(self, cache: UserProfileCache, repository_factory: Callable[[], UserRepository]):
+        self.cache = cache
+        self.repository_factory = repository_factory
+        self._repository: UserRepository | None = None
+
+    @property
+    def repository(self) -> UserRepository:
+        if self._repository is None:
+            self._repository = self.repository_factory()
+        return self._repository
+
+    async def create_user(self, user: UserDTO) -> UserDTO:
+        known = await self.cache.lookup(user.id)
+        if known == profile_hash(user):
+            metrics.USER_PROFILE_LOOKUPS.labels("unchanged").inc()
+            return user
+        if known is not None:
+            metrics.USER_PROFILE_LOOKUPS.labels("changed").inc()
+            self.cache.queue(user)
+            return user
+
+        metrics.USER_PROFILE_LOOKUPS.labels("unknown").inc()
+        stored = await self.repository.create_user(user)
+        await self.cache.remember([stored])
+        return stored
+
+    async def get_user(self, user_id: int) -> UserDTO | None:
+        return await self.repository.get_user(user_id)
+
+    async def upsert_users(self, users: list[UserDTO]) -> None:
+        await self.repository.upsert_users(users)
+        await self.cache.remember(users)
@@ -1,13 +1,22 @@
 import logging
+from typing import AsyncIterator
+
 from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.entities.market import MarketDTO, MarketCondition
+from src.domain.entities.market import ActiveMarketDTO, MarketDTO, MarketCondition, PriceSource
+from src.domain.exceptions import UserNotFoundError
 from src.domain.protocols.repositories.market import MarketRepository
 from src.infrastructure.db.models.market import Market
+from src.infrastructure.db.models.user import User
+from src.infrastructure.db.upsert import dialect_insert
 
 logger = logging.getLogger(__name__)
 
+# Stay well below SQLite's bound parameter limit
+BULK_CHUNK_SIZE = 500
+
 
 class SQLAlchemyMarketRepository(MarketRepository):
     def __init__(self, session: AsyncSession):
@@ -25,23 +34,43 @@ class SQLAlchemyMarketRepository(MarketRepository):
             condition=market.condition,
             is_active=market.is_active,
             created_at=market.created_at,
+            price_source=market.price_source,
         )
 
-    async def create_market(self, market: MarketDTO) -> MarketDTO:
-        db_market = Market(
-            user_id=market.user_id,
-            market_id=market.market_id,
-            token_id=market.token_id,
-            market_url=market.url,
-            market_title=market.title,
-            target_price=market.target_price,
-            condition=market.condition,
-            is_active=market.is_active
+    async def create_market(self, market: MarketDTO) -> MarketDTO | None:
+        """
+        Insert the market unless the user already tracks it.
+        Returns None on conflict; the unique index decides, so concurrent adds
+        cannot both succeed. Raises UserNotFoundError if the user row is missing.
+        """
+        stmt = (
+            dialect_insert(self.session, Market)
+            .values(
+                user_id=market.user_id,
+                market_id=market.market_id,
+                token_id=market.token_id,
+                market_url=market.url,
+                market_title=market.title,
+                target_price=market.target_price,
+                condition=market.condition,
+                is_active=market.is_active,
+                price_source=market.price_source,
+            )
+            .on_conflict_do_nothing(index_elements=[Market.user_id, Market.market_id])
+            .returning(Market)
         )
-        self.session.add(db_market)
+        try:
+            result = await self.session.execute(stmt)
+        except IntegrityError as e:
+            await self.session.rollback()
+            if await self.session.get(User, market.user_id) is None:
+                raise UserNotFoundError(market.user_id) from e
+            raise
+        db_market = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(db_market)
-        return self._to_dto(db_market)
+        if db_market:
+            return self._to_dto(db_market)
+        return None
 
     async def get_market_by_id(self, market_id: int) -> MarketDTO | None:
         stmt = select(Market).where(Market.id == market_id)
@@ -61,8 +90,7 @@ class SQLAlchemyMarketRepository(MarketRepository):
         logger.info(f"Checking DB for market. User: {user_id}, ID: '{market_id}'")
         stmt = select(Market).where(Market.user_id == user_id, Market.market_id == market_id)
         result = await self.session.execute(stmt)
-        # Use first() to handle potential duplicates safely (e.g. checking existence)
-        market = result.scalars().first()
+        market = result.scalar_one_or_none()
         if market:
             logger.info(f"Found existing market in DB: {market.id} (ID: {market.market_id})")
             return self._to_dto(market)
@@ -83,6 +111,20 @@ class SQLAlchemyMarketRepository(MarketRepository):
             return self._to_dto(market)
         return None
 
+    async def update_price_source(self, market_id: int, price_source: PriceSource) -> MarketDTO | None:
+        stmt = (
+            update(Market)
+            .where(Market.id == market_id)
+            .values(price_source=price_source)
+            .returning(Market)
+        )
+        result = await self.session.execute(stmt)
+        market = result.scalar_one_or_none()
+        await self.session.commit()
+        if market:
+            return self._to_dto(market)
+        return None
+
     async def delete_market(self, market_id: int) -> None:
         stmt = delete(Market).where(Market.id == market_id)
         await self.session.execute(stmt)
@@ -94,6 +136,35 @@ class SQLAlchemyMarketRepository(MarketRepository):
         markets = result.scalars().all()
         return [self._to_dto(m) for m in markets]
 
+    async def stream_active_markets(self, batch_size: int = 1000) -> AsyncIterator[list[ActiveMarketDTO]]:
+        """
+        Yield the active markets `batch_size` rows at a time, with only the
+        columns the monitor evaluates and without building ORM objects.
+        """
+        stmt = (
+            select(
+                Market.id,
+                Market.user_id,
+                Market.token_id,
+                Market.target_price,
+                Market.condition,
+                Market.price_source,
+            )
+            .where(Market.is_active == True)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            yield [ActiveMarketDTO(**row._mapping) for row in rows]
+
+    async def get_markets_by_ids(self, market_ids: list[int]) -> list[MarketDTO]:
+        markets = []
+        for i in range(0, len(market_ids), BULK_CHUNK_SIZE):
+            stmt = select(Market).where(Market.id.in_(market_ids[i:i + BULK_CHUNK_SIZE]))
+            result = await self.session.execute(stmt)
+            markets.extend(self._to_dto(m) for m in result.scalars().all())
+        return markets
+
     async def update_market_status(self, market_id: int, is_active: bool) -> MarketDTO | None:
         stmt = (
             update(Market)
@@ -107,3 +178,36 @@ class SQLAlchemyMarketRepository(MarketRepository):
         if market:
             return self._to_dto(market)
         return None
+
+    async def deactivate_markets(self, market_ids: list[int]) -> list[int]:
+        """
+        Disable all given markets in a single transaction.
+        Returns the ids that were still active, i.e. the ones this call disabled.
+        """
+        deactivated = []
+        for i in range(0, len(market_ids), BULK_CHUNK_SIZE):
+            stmt = (
+                update(Market)
+                .where(Market.id.in_(market_ids[i:i + BULK_CHUNK_SIZE]), Market.is_active == True)
+                .values(is_active=False)
+                .returning(Market.id)
+            )
+            result = await self.session.execute(stmt)
+            deactivated.extend(result.scalars().all())
+        await self.session.commit()
+        return deactivated
+
+    async def reactivate_markets(self, market_ids: list[int]) -> list[int]:
+        """Enable all given markets again, e.g. when their alert was never sent. Returns the ids enabled."""
+        reactivated = []
+        for i in range(0, len(market_ids), BULK_CHUNK_SIZE):
+            stmt = (
+                update(Market)
+                .where(Market.id.in_(market_ids[i:i + BULK_CHUNK_SIZE]), Market.is_active == False)
+                .values(is_active=True)
+                .returning(Market.id)
+            )
+            result = await self.session.execute(stmt)
+            reactivated.extend(result.scalars().all())
+        await self.session.commit()
+        return reactivated
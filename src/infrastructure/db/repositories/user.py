@@ -1,10 +1,13 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.sqlite import insert
 
 from src.domain.entities.user import UserDTO
 from src.domain.protocols.repositories.user import UserRepository
 from src.infrastructure.db.models.user import User
+from src.infrastructure.db.upsert import dialect_insert
+
+# Rows per multi-row upsert, three bound parameters each
+BULK_CHUNK_SIZE = 500
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -17,7 +20,7 @@ class SQLAlchemyUserRepository(UserRepository):
         # or fetch the DB state.
         # The on_conflict_do_update will preserve created_at unless we explicitly update it.
         
-        stmt = insert(User).values(
+        stmt = dialect_insert(self.session, User).values(
             id=user.id,
             username=user.username,
             full_name=user.full_name
@@ -40,6 +43,21 @@ class SQLAlchemyUserRepository(UserRepository):
             created_at=db_user.created_at
         )
 
+    async def upsert_users(self, users: list[UserDTO]) -> None:
+        """Insert or update many users in one statement and commit."""
+        if not users:
+            return
+        for i in range(0, len(users), BULK_CHUNK_SIZE):
+            stmt = dialect_insert(self.session, User).values(
+                [{"id": u.id, "username": u.username, "full_name": u.full_name} for u in users[i:i + BULK_CHUNK_SIZE]]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.id],
+                set_=dict(username=stmt.excluded.username, full_name=stmt.excluded.full_name),
+            )
+            await self.session.execute(stmt)
+        await self.session.commit()
+
     async def get_user(self, user_id: int) -> UserDTO | None:
         stmt = select(User).where(User.id == user_id)
         result = await self.session.execute(stmt)
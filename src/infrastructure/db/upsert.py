@@ -0,0 +1,17 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Both dialects share the ON CONFLICT API (on_conflict_do_nothing / _do_update)
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def dialect_insert(session: AsyncSession, entity):
+    """INSERT supporting ON CONFLICT on the backend `session` is bound to."""
+    dialect = session.bind.dialect.name
+    try:
+        return _INSERTS[dialect](entity)
+    except KeyError:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}") from None
@@ -0,0 +1,205 @@
+import logging
+import re
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Monitor
+MONITOR_TICK_SECONDS = Histogram(
+    "monitor_tick_duration_seconds",
+    "Wall time of a monitor polling tick",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+MONITOR_TICK_TOKENS = Gauge("monitor_tick_tokens", "Tokens priced in the last monitor tick")
+MONITOR_TICK_MARKETS = Gauge("monitor_tick_markets", "Markets evaluated in the last monitor tick")
+MONITOR_TOKENS_EVALUATED = Counter("monitor_tokens_evaluated_total", "Token prices evaluated, polled or streamed")
+MONITOR_MARKETS_EVALUATED = Counter("monitor_markets_evaluated_total", "Market conditions evaluated")
+MONITOR_MARKETS_TRIGGERED = Counter("monitor_markets_triggered_total", "Markets whose condition fired")
+MONITOR_TICKS_SKIPPED = Counter("monitor_ticks_skipped_total", "Ticks skipped because the previous one was still running")
+MONITOR_TICKS_BACKED_OFF = Counter(
+    "monitor_ticks_backed_off_total", "Ticks not polled because the Polymarket circuit breaker was open"
+)
+MONITOR_TICK_OVERRUNS = Counter("monitor_tick_overruns_total", "Ticks that ran out of budget")
+MONITOR_TICK_LAG = Gauge("monitor_tick_lag_seconds", "Delay between the scheduled and actual start of the last tick")
+MONITOR_ACTIVE_MARKETS = Gauge("monitor_active_markets", "Markets in the active registry")
+
+# Polymarket API client
+POLYMARKET_REQUEST_SECONDS = Histogram(
+    "polymarket_request_duration_seconds",
+    "Latency of Polymarket API requests",
+    ["endpoint"],
+)
+POLYMARKET_RESPONSES = Counter(
+    "polymarket_responses_total",
+    "Polymarket API responses by status code, 'error' for network failures",
+    ["endpoint", "status"],
+)
+POLYMARKET_POOL_QUEUED = Gauge(
+    "polymarket_pool_queued_requests",
+    "Requests waiting for a free connection in the pool",
+    ["pool"],
+)
+POLYMARKET_POOL_WAIT_SECONDS = Histogram(
+    "polymarket_pool_wait_seconds",
+    "Time requests spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+POLYMARKET_POOL_CONNECTIONS = Counter(
+    "polymarket_pool_connections_total",
+    "Connections handed out by the pool, 'new' or 'reused'",
+    ["pool", "kind"],
+)
+POLYMARKET_RETRIES = Counter(
+    "polymarket_retries_total",
+    "Polymarket requests retried, by host and reason",
+    ["host", "reason"],
+)
+POLYMARKET_BREAKER_STATE = Gauge(
+    "polymarket_breaker_state",
+    "Circuit breaker state per host: 0 closed, 1 half-open, 2 open",
+    ["host"],
+)
+POLYMARKET_SHORT_CIRCUITED = Counter(
+    "polymarket_short_circuited_total",
+    "Calls rejected without a request because the breaker was open",
+    ["host"],
+)
+POLYMARKET_CACHE_LOOKUPS = Counter(
+    "polymarket_cache_lookups_total",
+    "Market info cache lookups: hit, price_refresh, miss or coalesced",
+    ["result"],
+)
+POLYMARKET_EVENT_CACHE_LOOKUPS = Counter(
+    "polymarket_event_cache_lookups_total",
+    "Event cache lookups: hit, stale or miss",
+    ["result"],
+)
+POLYMARKET_EVENT_REVALIDATIONS = Counter(
+    "polymarket_event_revalidations_total",
+    "Event fetches by outcome: not_modified (304) or modified",
+    ["result"],
+)
+
+# Notifications
+NOTIFICATIONS_SENT = Counter("notifications_sent_total", "Alerts delivered to Telegram")
+NOTIFICATIONS_FAILED = Counter("notifications_failed_total", "Alerts dropped after failing")
+NOTIFICATIONS_RETRIED = Counter("notifications_retried_total", "Alert deliveries scheduled for retry")
+NOTIFICATION_QUEUE_DEPTH = Gauge("notification_queue_depth", "Alerts waiting to be sent")
+NOTIFICATION_SEND_SECONDS = Histogram("notification_send_duration_seconds", "Latency of send_message calls")
+
+# Database
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+# Handlers
+HANDLER_SECONDS = Histogram(
+    "handler_duration_seconds",
+    "aiogram handler latency",
+    ["router", "event_type"],
+)
+UPDATE_DEPENDENCY_SECONDS = Histogram(
+    "update_dependency_seconds",
+    "Time spent building use cases and repositories for an update",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+UPDATE_DB_SESSIONS = Counter("update_db_sessions_total", "Database sessions created for updates")
+
+# Users
+USER_PROFILE_LOOKUPS = Counter(
+    "user_profile_lookups_total",
+    "User saves by cached profile: unchanged (skipped), changed (batched) or unknown (written)",
+    ["result"],
+)
+USER_PROFILES_FLUSHED = Counter("user_profiles_flushed_total", "Changed user profiles written in batches")
+
+# Ids in paths would make every market its own label value
+_ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*")
+
+
+def polymarket_trace_config(pool: str) -> aiohttp.TraceConfig:
+    """Request timing and pool saturation hooks for a Polymarket client session."""
+
+    def endpoint(params) -> str:
+        return f"{params.url.host}{_ID_SEGMENT.sub('/{id}', params.url.path)}"
+
+    async def on_request_start(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestStartParams):
+        ctx.started = time.perf_counter()
+
+    async def on_request_end(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestEndParams):
+        name = endpoint(params)
+        POLYMARKET_REQUEST_SECONDS.labels(name).observe(time.perf_counter() - ctx.started)
+        POLYMARKET_RESPONSES.labels(name, str(params.response.status)).inc()
+
+    async def on_request_exception(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams):
+        name = endpoint(params)
+        POLYMARKET_REQUEST_SECONDS.labels(name).observe(time.perf_counter() - ctx.started)
+        POLYMARKET_RESPONSES.labels(name, "error").inc()
+
+    async def on_connection_queued_start(session, ctx: SimpleNamespace, params):
+        ctx.queued = time.perf_counter()
+        POLYMARKET_POOL_QUEUED.labels(pool).inc()
+
+    async def on_connection_queued_end(session, ctx: SimpleNamespace, params):
+        POLYMARKET_POOL_QUEUED.labels(pool).dec()
+        POLYMARKET_POOL_WAIT_SECONDS.labels(pool).observe(time.perf_counter() - ctx.queued)
+
+    async def on_connection_create_end(session, ctx: SimpleNamespace, params):
+        POLYMARKET_POOL_CONNECTIONS.labels(pool, "new").inc()
+
+    async def on_connection_reuseconn(session, ctx: SimpleNamespace, params):
+        POLYMARKET_POOL_CONNECTIONS.labels(pool, "reused").inc()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Time every statement executed through `engine`."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        kind = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+        DB_QUERY_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.types import InlineKeyboardMarkup
+
+from src.infrastructure import metrics
+from src.infrastructure.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Notification:
+    chat_id: int
+    text: str
+    reply_markup: InlineKeyboardMarkup | None = None
+    # Market whose alert this is, reactivated if the message is never sent
+    market_id: int | None = None
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class DispatcherStats:
+    queue_depth: int
+    deferred: int
+    sent: int
+    failed: int
+    retried: int
+    avg_send_latency: float  # seconds spent in send_message
+    avg_delivery_latency: float  # seconds from enqueue to delivery
+
+
+class NotificationDispatcher:
+    """
+    Queue of outgoing Telegram messages drained by worker tasks.
+
+    Sends respect a global and a per-chat token bucket. Flood control
+    (`TelegramRetryAfter`) and transient network errors are retried later
+    without blocking the workers, so callers only ever pay for `enqueue`.
+    `stop` delivers what is still queued before the workers go away.
+    """
+
+    # Idle per-chat buckets are dropped once there are more than this many
+    MAX_CHAT_BUCKETS = 10_000
+    # Weight of the newest sample in the latency moving averages
+    LATENCY_SMOOTHING = 0.1
+
+    def __init__(
+        self,
+        bot: Bot,
+        workers: int = 4,
+        global_rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+        max_attempts: int = 5,
+    ):
+        self.bot = bot
+        self.workers = workers
+        self.per_chat_rate = per_chat_rate
+        self.max_attempts = max_attempts
+
+        self._queue: asyncio.Queue[Notification] = asyncio.Queue()
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._deferred: dict[asyncio.TimerHandle, Notification] = {}
+        self._tasks: list[asyncio.Task] = []
+
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+        self._send_latency = 0.0
+        self._delivery_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> DispatcherStats:
+        return DispatcherStats(
+            queue_depth=self.queue_depth,
+            deferred=len(self._deferred),
+            sent=self._sent,
+            failed=self._failed,
+            retried=self._retried,
+            avg_send_latency=self._send_latency,
+            avg_delivery_latency=self._delivery_latency,
+        )
+
+    async def start(self):
+        metrics.NOTIFICATION_QUEUE_DEPTH.set_function(lambda: self.queue_depth + len(self._deferred))
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0) -> list[Notification]:
+        """
+        Deliver the queued and deferred messages for up to `drain_timeout`
+        seconds, then stop the workers. Returns the messages left unsent.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + drain_timeout
+        # Deferred retries run now rather than when their timer fires
+        for handle, notification in list(self._deferred.items()):
+            handle.cancel()
+            del self._deferred[handle]
+            self._queue.put_nowait(notification)
+        while self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+            if not self._deferred:
+                break
+            # Chats over their rate were deferred again, wait for the first to come back
+            earliest = min(handle.when() for handle in self._deferred)
+            if earliest >= deadline:
+                break
+            await asyncio.sleep(max(0.0, earliest - loop.time()))
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        undelivered = list(self._deferred.values())
+        for handle in self._deferred:
+            handle.cancel()
+        self._deferred.clear()
+        while not self._queue.empty():
+            undelivered.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if undelivered:
+            logger.warning(f"Notification dispatcher stopped with {len(undelivered)} undelivered messages")
+        return undelivered
+
+    def enqueue(self, notification: Notification):
+        self._queue.put_nowait(notification)
+
+    def _defer(self, notification: Notification, delay: float):
+        loop = asyncio.get_running_loop()
+
+        def requeue():
+            self._deferred.pop(handle, None)
+            self._queue.put_nowait(notification)
+
+        handle = loop.call_later(delay, requeue)
+        self._deferred[handle] = notification
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.MAX_CHAT_BUCKETS:
+                self._chat_buckets = {cid: b for cid, b in self._chat_buckets.items() if not b.is_full}
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate)
+        return bucket
+
+    async def _worker(self):
+        while True:
+            notification = await self._queue.get()
+            try:
+                # Do not hold a worker on a busy chat, come back when its bucket refills
+                wait = self._chat_bucket(notification.chat_id).try_acquire()
+                if wait > 0:
+                    self._defer(notification, wait)
+                    continue
+
+                try:
+                    await self._global_bucket.acquire()
+                    await self._send(notification)
+                except asyncio.CancelledError:
+                    # Stopped before the send completed, leave it for `stop` to
+                    # return: a message that did go out is repeated, never lost
+                    self._queue.put_nowait(notification)
+                    raise
+            except Exception as e:
+                logger.error(f"Unexpected error dispatching notification to {notification.chat_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, notification: Notification):
+        notification.attempts += 1
+        started = time.monotonic()
+        try:
+            await self.bot.send_message(
+                notification.chat_id,
+                notification.text,
+                reply_markup=notification.reply_markup,
+            )
+        except TelegramRetryAfter as e:
+            logger.warning(f"Flood control for {notification.chat_id}, retrying in {e.retry_after}s")
+            self._retry(notification, e.retry_after)
+        except TelegramForbiddenError as e:
+            # The user blocked the bot, retrying will not help
+            self._failed += 1
+            metrics.NOTIFICATIONS_FAILED.inc()
+            logger.warning(f"Cannot notify {notification.chat_id}: {e}")
+        except (TelegramNetworkError, TelegramServerError) as e:
+            logger.warning(f"Transient error notifying {notification.chat_id}: {e}")
+            self._retry(notification, 2 ** notification.attempts)
+        except Exception as e:
+            self._failed += 1
+            metrics.NOTIFICATIONS_FAILED.inc()
+            logger.error(f"Failed to send notification to {notification.chat_id}: {e}")
+        else:
+            finished = time.monotonic()
+            self._sent += 1
+            metrics.NOTIFICATIONS_SENT.inc()
+            metrics.NOTIFICATION_SEND_SECONDS.observe(finished - started)
+            self._send_latency += self.LATENCY_SMOOTHING * (finished - started - self._send_latency)
+            self._delivery_latency += self.LATENCY_SMOOTHING * (
+                finished - notification.enqueued_at - self._delivery_latency
+            )
+
+    def _retry(self, notification: Notification, delay: float):
+        if notification.attempts >= self.max_attempts:
+            self._failed += 1
+            metrics.NOTIFICATIONS_FAILED.inc()
+            logger.error(f"Giving up on notification to {notification.chat_id} after {notification.attempts} attempts")
+            return
+        self._retried += 1
+        metrics.NOTIFICATIONS_RETRIED.inc()
+        self._defer(notification, delay)
@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from src.domain.entities.market import EventMarketsDTO, MarketInfoDTO, MarketOptionDTO, QuoteDTO
+from src.domain.exceptions import MarketApiError
+from src.domain.protocols.polymarket import PolymarketAPI
+from src.infrastructure import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry:
+    info: MarketInfoDTO
+    metadata_expires: float
+    price_expires: float
+
+
+@dataclass
+class _EventEntry:
+    markets: list[MarketOptionDTO]
+    etag: str | None
+    last_modified: str | None
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass
+class CacheStats:
+    size: int
+    hits: int
+    price_refreshes: int  # metadata was fresh, only the price was fetched
+    misses: int
+    coalesced: int  # callers that joined a request already in flight
+    events: int
+    event_markets: int
+    event_hits: int
+    event_stale_hits: int  # served stale while revalidating in the background
+    event_misses: int
+    event_not_modified: int  # revalidations answered with 304
+
+
+class CachedPolymarketAPI(PolymarketAPI):
+    """
+    `PolymarketAPI` decorator caching market and event lookups in bounded LRUs.
+
+    Title, slug and token id change rarely and live for `metadata_ttl`; the
+    price goes stale after `price_ttl` and is then refreshed through the cheap
+    CLOB price endpoint while the metadata is still fresh. Concurrent callers
+    asking for the same market share a single upstream request.
+
+    Events are cached by slug for `event_ttl`. Until `event_max_stale` they are
+    served stale while a conditional request (ETag / If-Modified-Since)
+    revalidates them in the background. The total number of cached event
+    markets is capped at `max_event_markets`.
+    """
+
+    def __init__(
+        self,
+        api: PolymarketAPI,
+        max_entries: int = 10_000,
+        metadata_ttl: float = 3600.0,
+        price_ttl: float = 5.0,
+        event_ttl: float = 60.0,
+        event_max_stale: float = 3600.0,
+        max_event_markets: int = 50_000,
+    ):
+        self.api = api
+        self.max_entries = max_entries
+        self.metadata_ttl = metadata_ttl
+        self.price_ttl = min(price_ttl, metadata_ttl)
+
+        self.event_ttl = event_ttl
+        self.event_max_stale = max(event_max_stale, event_ttl)
+        self.max_event_markets = max_event_markets
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._events: OrderedDict[str, _EventEntry] = OrderedDict()
+        self._event_markets = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+        self._hits = 0
+        self._price_refreshes = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._event_hits = 0
+        self._event_stale_hits = 0
+        self._event_misses = 0
+        self._event_not_modified = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            price_refreshes=self._price_refreshes,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            events=len(self._events),
+            event_markets=self._event_markets,
+            event_hits=self._event_hits,
+            event_stale_hits=self._event_stale_hits,
+            event_misses=self._event_misses,
+            event_not_modified=self._event_not_modified,
+        )
+
+    async def close(self):
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def invalidate(self, market_id: str):
+        self._entries.pop(market_id, None)
+
+    async def get_market_info(self, market_id: str) -> MarketInfoDTO:
+        now = time.monotonic()
+        entry = self._entries.get(market_id)
+
+        if entry is not None and now < entry.price_expires:
+            self._entries.move_to_end(market_id)
+            self._hits += 1
+            metrics.POLYMARKET_CACHE_LOOKUPS.labels("hit").inc()
+            info = entry.info
+        elif entry is not None and now < entry.metadata_expires and entry.info.token_id:
+            self._price_refreshes += 1
+            metrics.POLYMARKET_CACHE_LOOKUPS.labels("price_refresh").inc()
+            info = await self._single_flight(("price", market_id), lambda: self._refresh_price(entry))
+        else:
+            self._misses += 1
+            metrics.POLYMARKET_CACHE_LOOKUPS.labels("miss").inc()
+            info = await self._single_flight(("info", market_id), lambda: self._fetch_info(market_id))
+
+        # Callers get their own copy so they cannot change what is cached
+        return replace(info)
+
+    async def get_markets_info_batch(self, market_ids: list[str]) -> dict[str, MarketInfoDTO]:
+        now = time.monotonic()
+        result = {}
+        missing = []
+        for market_id in dict.fromkeys(market_ids):
+            entry = self._entries.get(market_id)
+            if entry is not None and now < entry.price_expires:
+                self._hits += 1
+                metrics.POLYMARKET_CACHE_LOOKUPS.labels("hit").inc()
+                result[market_id] = replace(entry.info)
+            else:
+                missing.append(market_id)
+
+        if missing:
+            self._misses += len(missing)
+            metrics.POLYMARKET_CACHE_LOOKUPS.labels("miss").inc(len(missing))
+            fetched = await self.api.get_markets_info_batch(missing)
+            now = time.monotonic()
+            for market_id, info in fetched.items():
+                self._store(market_id, _Entry(info, now + self.metadata_ttl, now + self.price_ttl))
+                result[market_id] = replace(info)
+        return result
+
+    async def get_event_markets(self, slug: str) -> list[MarketOptionDTO]:
+        now = time.monotonic()
+        entry = self._events.get(slug)
+
+        if entry is not None and now < entry.fresh_until:
+            self._events.move_to_end(slug)
+            self._event_hits += 1
+            metrics.POLYMARKET_EVENT_CACHE_LOOKUPS.labels("hit").inc()
+        elif entry is not None and now < entry.stale_until:
+            self._events.move_to_end(slug)
+            self._event_stale_hits += 1
+            metrics.POLYMARKET_EVENT_CACHE_LOOKUPS.labels("stale").inc()
+            task, created = self._start_flight(("event", slug), lambda: self._fetch_event(slug, entry))
+            if created:
+                task.add_done_callback(lambda t: self._log_revalidation(slug, t))
+        else:
+            self._event_misses += 1
+            metrics.POLYMARKET_EVENT_CACHE_LOOKUPS.labels("miss").inc()
+            # An expired entry still carries validators, the answer may be a 304
+            entry = await self._single_flight(("event", slug), lambda: self._fetch_event(slug, entry))
+
+        return list(entry.markets)
+
+    async def get_event_markets_conditional(
+        self, slug: str, etag: str | None = None, last_modified: str | None = None
+    ) -> EventMarketsDTO:
+        return await self.api.get_event_markets_conditional(slug, etag, last_modified)
+
+    async def get_prices_batch(self, token_ids: list[str]) -> dict[str, float]:
+        return await self.api.get_prices_batch(token_ids)
+
+    async def get_quotes_batch(self, token_ids: list[str]) -> dict[str, QuoteDTO]:
+        return await self.api.get_quotes_batch(token_ids)
+
+    async def _fetch_info(self, market_id: str) -> MarketInfoDTO:
+        info = await self.api.get_market_info(market_id)
+        now = time.monotonic()
+        self._store(market_id, _Entry(info, now + self.metadata_ttl, now + self.price_ttl))
+        return info
+
+    async def _refresh_price(self, entry: _Entry) -> MarketInfoDTO:
+        market_id = entry.info.market_id
+        try:
+            prices = await self.api.get_prices_batch([entry.info.token_id])
+        except MarketApiError as e:
+            logger.warning(f"Price refresh for market {market_id} failed, fetching it from gamma: {e}")
+            prices = {}
+        price = prices.get(entry.info.token_id)
+        if price is None:
+            # No quote on the book or no answer from CLOB, let gamma work out a price
+            return await self._fetch_info(market_id)
+
+        info = replace(entry.info, price=price)
+        self._store(market_id, _Entry(info, entry.metadata_expires, time.monotonic() + self.price_ttl))
+        return info
+
+    async def _fetch_event(self, slug: str, entry: _EventEntry | None) -> _EventEntry:
+        response = await self.api.get_event_markets_conditional(
+            slug,
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None,
+        )
+        if response.markets is None and entry is not None:
+            self._event_not_modified += 1
+            metrics.POLYMARKET_EVENT_REVALIDATIONS.labels("not_modified").inc()
+            markets = entry.markets
+        else:
+            metrics.POLYMARKET_EVENT_REVALIDATIONS.labels("modified").inc()
+            markets = response.markets or []
+
+        now = time.monotonic()
+        fresh = _EventEntry(
+            markets=markets,
+            etag=response.etag,
+            last_modified=response.last_modified,
+            fresh_until=now + self.event_ttl,
+            stale_until=now + self.event_max_stale,
+        )
+        self._store_event(slug, fresh)
+        return fresh
+
+    def _log_revalidation(self, slug: str, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background revalidation of event {slug} failed: {task.exception()}")
+
+    def _store_event(self, slug: str, entry: _EventEntry):
+        previous = self._events.pop(slug, None)
+        if previous is not None:
+            self._event_markets -= len(previous.markets)
+        self._events[slug] = entry
+        self._event_markets += len(entry.markets)
+        # Always keep the newest entry, even if it alone is over the cap
+        while self._event_markets > self.max_event_markets and len(self._events) > 1:
+            _, evicted = self._events.popitem(last=False)
+            self._event_markets -= len(evicted.markets)
+
+    def _store(self, market_id: str, entry: _Entry):
+        self._entries[market_id] = entry
+        self._entries.move_to_end(market_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _start_flight(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> tuple[asyncio.Task, bool]:
+        task = self._in_flight.get(key)
+        if task is not None:
+            return task, False
+        task = asyncio.ensure_future(factory())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._flight_done(key, t))
+        return task, True
+
+    async def _single_flight(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task, created = self._start_flight(key, factory)
+        if not created:
+            self._coalesced += 1
+            metrics.POLYMARKET_CACHE_LOOKUPS.labels("coalesced").inc()
+        # A caller giving up must not cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    def _flight_done(self, key: Hashable, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        # Mark the error as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -1,238 +1,435 @@
 import aiohttp
-import json
+import asyncio
 import logging
-from typing import Optional
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
 
-from src.domain.entities.market import MarketInfoDTO, MarketOptionDTO
+from src.domain.entities.market import EventMarketsDTO, MarketInfoDTO, MarketOptionDTO, QuoteDTO
 from src.domain.protocols.polymarket import PolymarketAPI
-from src.domain.exceptions import MarketNotFoundError, MarketApiError
+from src.domain.exceptions import MarketNotFoundError, MarketApiError, PolymarketUnavailableError
+from src.infrastructure import metrics
+from src.infrastructure.metrics import polymarket_trace_config
+from src.infrastructure.polymarket import payloads
+from src.infrastructure.polymarket.resilience import BreakerState, CircuitBreaker, RetryPolicy, parse_retry_after
+from src.infrastructure.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PoolConfig:
+    """Connection pool, rate limit and timeout settings for one upstream host."""
+    rate: float = 10.0  # requests per second
+    limit: int = 100
+    limit_per_host: int = 20
+    dns_cache_seconds: int = 300
+    keepalive_seconds: float = 30.0
+    connect_timeout: float = 5.0
+    total_timeout: float = 15.0
+
+
 class PolymarketApiClient(PolymarketAPI):
     BASE_URL = "https://gamma-api.polymarket.com"
     CLOB_API_URL = "https://clob.polymarket.com"
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
-        self._session = session
+    # Metadata lookups back dialog getters, so they must fail fast: these
+    # bound the whole call, retries included
+    MARKET_INFO_TIMEOUT = aiohttp.ClientTimeout(total=10)
+    EVENT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+    # Ids per /markets listing request, keeps the query string well under URL limits
+    MARKETS_BATCH_SIZE = 50
+    # Page size of the listing, gamma caps it server side
+    MARKETS_PAGE_LIMIT = 100
+    MARKETS_BATCH_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        gamma_pool: PoolConfig | None = None,
+        clob_pool: PoolConfig | None = None,
+        retry: RetryPolicy | None = None,
+        breaker_threshold: int = 5,
+        breaker_recovery_seconds: float = 30.0,
+        gamma_url: str | None = None,
+        clob_url: str | None = None,
+    ):
+        # Point the client at another deployment, e.g. the local fake server
+        if gamma_url:
+            self.BASE_URL = gamma_url.rstrip("/")
+        if clob_url:
+            self.CLOB_API_URL = clob_url.rstrip("/")
+
+        # An injected session is shared by both hosts and owned by the caller
+        self._gamma_session = session
+        self._clob_session = session
         self._owns_session = False
+        self.gamma_pool = gamma_pool or PoolConfig()
+        self.clob_pool = clob_pool or PoolConfig()
+        self.retry = retry or RetryPolicy()
+        self._buckets = {
+            "gamma": TokenBucket(self.gamma_pool.rate),
+            "clob": TokenBucket(self.clob_pool.rate),
+        }
+        self.breakers = {
+            host: CircuitBreaker(host, breaker_threshold, breaker_recovery_seconds)
+            for host in ("gamma", "clob")
+        }
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
+    def breaker_states(self) -> dict[str, BreakerState]:
+        return {host: breaker.state for host, breaker in self.breakers.items()}
+
+    @property
+    def prices_available(self) -> bool:
+        """False while the CLOB breaker is open and price polls would be rejected."""
+        return not self.breakers["clob"].is_open
+
+    @staticmethod
+    def _create_session(pool: PoolConfig, name: str) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=pool.limit,
+            limit_per_host=pool.limit_per_host,
+            ttl_dns_cache=pool.dns_cache_seconds,
+            keepalive_timeout=pool.keepalive_seconds,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=pool.total_timeout, connect=pool.connect_timeout),
+            headers={"Accept-Encoding": "gzip, deflate"},
+            trace_configs=[polymarket_trace_config(name)],
+        )
+
+    async def start(self, warm_up: bool = True):
+        """Create both pools up front and open a first connection to each host."""
+        if self._gamma_session is None:
+            self._gamma_session = self._create_session(self.gamma_pool, "gamma")
+            self._clob_session = self._create_session(self.clob_pool, "clob")
             self._owns_session = True
-        return self._session
+
+        if warm_up:
+            await asyncio.gather(
+                self._warm_up(self._gamma_session, self.BASE_URL),
+                self._warm_up(self._clob_session, self.CLOB_API_URL),
+            )
+
+    @staticmethod
+    async def _warm_up(session: aiohttp.ClientSession, url: str):
+        # Any response will do, we only want DNS resolved and a pooled connection
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Could not warm up connection to {url}: {e}")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._gamma_session is None:
+            await self.start(warm_up=False)
+        return self._gamma_session
+
+    async def _get_clob_session(self) -> aiohttp.ClientSession:
+        if self._clob_session is None:
+            await self.start(warm_up=False)
+        return self._clob_session
+
+    async def _request(
+        self, host: str, method: str, url: str, deadline: float | None = None, **kwargs
+    ) -> tuple[int, bytes, Mapping[str, str]]:
+        """
+        Rate-limited request through the host's circuit breaker.
+
+        429s, 5xx responses and network errors are retried with jittered
+        backoff (or after Retry-After) while the retry policy allows; then the
+        last status is returned or the last network error re-raised. Only use
+        it for idempotent calls.
+
+        `deadline` caps the whole call, retries and backoff included, in
+        seconds: each attempt gets the pool's timeouts, its total cut to the
+        time left, and no retry is made that would start after it.
+        """
+        session = await (self._get_session() if host == "gamma" else self._get_clob_session())
+        pool = self.gamma_pool if host == "gamma" else self.clob_pool
+        breaker = self.breakers[host]
+        expires = time.monotonic() + deadline if deadline is not None else None
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                metrics.POLYMARKET_SHORT_CIRCUITED.labels(host).inc()
+                raise PolymarketUnavailableError(host, breaker.retry_in)
+            await self._buckets[host].acquire()
+            if expires is not None:
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                # Keep the connect timeout, a stalled connect must leave time to retry
+                kwargs["timeout"] = aiohttp.ClientTimeout(
+                    total=min(remaining, pool.total_timeout), connect=pool.connect_timeout
+                )
+
+            attempt += 1
+            retry_after = None
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    status, body, headers = response.status, await response.read(), response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else "network"
+                delay = self._within(expires, self.retry.delay(attempt))
+                if delay is None:
+                    raise
+            else:
+                if status != 429 and status < 500:
+                    breaker.record_success()
+                    return status, body, headers
+                reason = str(status)
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                delay = self._within(expires, self.retry.delay(attempt, retry_after))
+                # Throttling says nothing about upstream health unless it persists
+                if status >= 500 or delay is None:
+                    breaker.record_failure()
+                if delay is None:
+                    return status, body, headers
+
+            metrics.POLYMARKET_RETRIES.labels(host, reason).inc()
+            logger.warning(f"{method} {url} failed ({reason}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _within(expires: float | None, delay: float | None) -> float | None:
+        """`delay`, or None when the retry would start after `expires`."""
+        if delay is None or expires is None:
+            return delay
+        return delay if time.monotonic() + delay < expires else None
 
     async def close(self):
-        if self._owns_session and self._session:
-            await self._session.close()
-            self._session = None
+        if self._owns_session and self._gamma_session:
+            await self._gamma_session.close()
+            await self._clob_session.close()
+            self._gamma_session = None
+            self._clob_session = None
 
     async def get_event_markets(self, slug: str) -> list[MarketOptionDTO]:
-        session = await self._get_session()
+        return (await self.get_event_markets_conditional(slug)).markets
+
+    async def get_event_markets_conditional(
+        self, slug: str, etag: str | None = None, last_modified: str | None = None
+    ) -> EventMarketsDTO:
+        """Fetch an event's open markets; `markets` is None if the validators still match."""
         url = f"{self.BASE_URL}/events"
         params = {"slug": slug}
-        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
         try:
-            async with session.get(url, params=params) as response:
-                if response.status != 200:
-                    raise MarketApiError(f"Failed to fetch event: {response.status}")
-                
-                data = await response.json()
-                
-                if not data:
-                    raise MarketNotFoundError(slug)
-                
-                event = data[0]
-                markets_data = event.get("markets", [])
-                
-                return [
-                    MarketOptionDTO(
-                        id=m["id"], 
-                        question=m.get("question", "Unknown Question"),
-                        active=m.get("active", True)
-                    ) 
-                    for m in markets_data
-                    if m.get("closed") is False
-                ]
+            status, body, response_headers = await self._request(
+                "gamma", "GET", url, params=params, headers=headers, deadline=self.EVENT_TIMEOUT.total
+            )
+            if status == 304:
+                return EventMarketsDTO(markets=None, etag=etag, last_modified=last_modified)
+            if status != 200:
+                raise MarketApiError(f"Failed to fetch event: {status}")
+
+            events = payloads.decode_events(body)
+            if not events:
+                raise MarketNotFoundError(slug)
+
+            return EventMarketsDTO(
+                markets=[
+                    MarketOptionDTO(id=m.id, question=m.question, active=m.active)
+                    for m in events[0].markets
+                    if m.closed is False
+                ],
+                etag=response_headers.get("ETag"),
+                last_modified=response_headers.get("Last-Modified"),
+            )
+        except payloads.DecodeError as e:
+            raise MarketApiError(f"Malformed event payload: {e}")
+        except asyncio.TimeoutError:
+            raise MarketApiError("Request timed out")
         except aiohttp.ClientError as e:
             raise MarketApiError(f"Network error: {str(e)}")
 
     async def get_market_info(self, market_id: str) -> MarketInfoDTO:
         # Fetch by Market ID directly
-        session = await self._get_session()
         url = f"{self.BASE_URL}/markets/{market_id}"
         
         try:
             logger.debug(f"Fetching market info for {market_id} from {url}")
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch market info for {market_id}: HTTP {response.status}")
-                    raise MarketApiError(f"Failed to fetch market info: {response.status}")
-                
-                data = await response.json()
-                logger.debug(f"API response for {market_id} - json: {data}")
-                
-                title = data.get("question", "Unknown Market")
-                slug = data.get("slug")
-                
-                # Extract token_id
-                token_id = None
-                clob_token_ids = data.get("clobTokenIds", [])
-                if isinstance(clob_token_ids, str):
-                    try:
-                        clob_token_ids = json.loads(clob_token_ids)
-                    except json.JSONDecodeError:
-                        clob_token_ids = []
-                
-                if isinstance(clob_token_ids, list) and len(clob_token_ids) > 0:
-                    token_id = clob_token_ids[0]
-                
-                current_price = 0.0
-                
-                # First priority: use bestBid price
-                if "bestAsk" in data and data["bestAsk"] is not None:
-                    try:
-                        current_price = float(data["bestAsk"])
-                        logger.debug(f"Using bestAsk for {market_id}: {current_price}")
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Could not parse bestAsk for {market_id}: {data.get('bestAsk')}, error: {e}")
-                
-                # Fallback: try outcomePrices array (assuming first is Yes)
-                if current_price == 0.0:
-                    outcome_prices = data.get("outcomePrices", [])
-                    logger.debug(f"outcomePrices for {market_id}: {outcome_prices}")
-                    
-                    if outcome_prices:
-                        try:
-                            # Handle case where outcomePrices might be a JSON string
-                            if isinstance(outcome_prices, str):
-                                outcome_prices = json.loads(outcome_prices)
-                            
-                            if isinstance(outcome_prices, list) and len(outcome_prices) > 0:
-                                current_price = float(outcome_prices[0])
-                                logger.debug(f"Using outcomePrices[0] for {market_id}: {current_price}")
-                        except (ValueError, IndexError, TypeError, json.JSONDecodeError) as e:
-                            logger.error(f"Error parsing outcomePrices for {market_id}: {e}, outcomePrices={outcome_prices}")
-                
-                # Fallback: try to find the "Yes" outcome from the outcomes array
-                if current_price == 0.0:
-                    outcomes = data.get("outcomes", [])
-                    logger.debug(f"outcomes for {market_id}: {outcomes}")
-                    
-                    if outcomes:
-                        # Handle case where outcomes might be a JSON string
-                        if isinstance(outcomes, str):
-                            try:
-                                outcomes = json.loads(outcomes)
-                            except json.JSONDecodeError:
-                                logger.warning(f"Could not parse outcomes JSON string for {market_id}")
-                                outcomes = []
-                        
-                        if isinstance(outcomes, list):
-                            # Look for the "Yes" outcome
-                            yes_outcome = None
-                            for outcome in outcomes:
-                                if isinstance(outcome, dict):
-                                    outcome_name = outcome.get("name", "").lower()
-                                    logger.debug(f"Checking outcome: {outcome}, name: {outcome_name}")
-                                    if "yes" in outcome_name:
-                                        yes_outcome = outcome
-                                        break
-                                elif isinstance(outcome, str) and "yes" in outcome.lower():
-                                    yes_outcome = outcome
-                                    break
-                            
-                            if yes_outcome:
-                                # Extract price from Yes outcome
-                                if isinstance(yes_outcome, dict):
-                                    # Try different possible price fields
-                                    price = yes_outcome.get("price") or yes_outcome.get("currentPrice") or yes_outcome.get("lastPrice")
-                                    if price is not None:
-                                        try:
-                                            current_price = float(price)
-                                            logger.debug(f"Found Yes outcome price for {market_id}: {current_price}")
-                                        except (ValueError, TypeError):
-                                            logger.warning(f"Could not parse Yes outcome price for {market_id}: {price}")
-                
-                # Fallback: try direct price fields
-                if current_price == 0.0:
-                    logger.debug(f"Checking alternative price fields for {market_id}")
-                    
-                    # Check common alternative fields
-                    if "yesPrice" in data:
-                        try:
-                            current_price = float(data["yesPrice"])
-                            logger.debug(f"Found 'yesPrice' field for {market_id}: {current_price}")
-                        except (ValueError, TypeError):
-                            logger.warning(f"Could not parse yesPrice for {market_id}: {data.get('yesPrice')}")
-                    elif "currentPrice" in data:
-                        try:
-                            current_price = float(data["currentPrice"])
-                            logger.debug(f"Found 'currentPrice' field for {market_id}: {current_price}")
-                        except (ValueError, TypeError):
-                            logger.warning(f"Could not parse currentPrice for {market_id}: {data.get('currentPrice')}")
-                    elif "lastTradePrice" in data:
-                        try:
-                            current_price = float(data["lastTradePrice"])
-                            logger.debug(f"Found 'lastTradePrice' field for {market_id}: {current_price}")
-                        except (ValueError, TypeError):
-                            logger.warning(f"Could not parse lastTradePrice for {market_id}: {data.get('lastTradePrice')}")
-                
-                if current_price == 0.0:
-                    logger.warning(f"Could not find price for {market_id}, defaulting to 0.0")
-
-                logger.info(f"Market {market_id} ({title}): price={current_price}")
-                return MarketInfoDTO(
-                    title=title,
-                    price=current_price,
-                    market_id=market_id,
-                    slug=slug,
-                    token_id=token_id
-                )
+            status, body, _ = await self._request("gamma", "GET", url, deadline=self.MARKET_INFO_TIMEOUT.total)
+            if status != 200:
+                logger.error(f"Failed to fetch market info for {market_id}: HTTP {status}")
+                raise MarketApiError(f"Failed to fetch market info: {status}")
+
+            info = self._market_info(payloads.decode_market(body), market_id)
+            if info.price == 0.0:
+                logger.warning(f"Could not find price for {market_id}, defaulting to 0.0")
+            logger.info(f"Market {market_id} ({info.title}): price={info.price}")
+            return info
+        except payloads.DecodeError as e:
+            logger.error(f"Malformed market payload for {market_id}: {e}")
+            raise MarketApiError(f"Malformed market payload: {e}")
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out fetching market {market_id}")
+            raise MarketApiError("Request timed out")
         except aiohttp.ClientError as e:
             logger.error(f"Network error fetching market {market_id}: {e}")
             raise MarketApiError(f"Network error: {str(e)}")
 
+    async def get_markets_info_batch(self, market_ids: list[str]) -> dict[str, MarketInfoDTO]:
+        """
+        Fetch metadata for many markets through the gamma listing endpoint.
+
+        Ids are split into chunks of MARKETS_BATCH_SIZE fetched concurrently,
+        each paginated. Unknown ids are missing from the result, and so are
+        the ids of a chunk that failed: failed chunks are logged and skipped,
+        the others still returned. Only when every chunk fails is the error
+        raised.
+        """
+        unique_ids = list(dict.fromkeys(str(market_id) for market_id in market_ids))
+        if not unique_ids:
+            return {}
+
+        chunks = [
+            unique_ids[i:i + self.MARKETS_BATCH_SIZE]
+            for i in range(0, len(unique_ids), self.MARKETS_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(self.MARKETS_BATCH_CONCURRENCY)
+
+        async def fetch(chunk: list[str]) -> list[MarketInfoDTO]:
+            async with semaphore:
+                return await self._fetch_markets_chunk(chunk)
+
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks), return_exceptions=True)
+        failed = [(chunk, r) for chunk, r in zip(chunks, results) if isinstance(r, BaseException)]
+        if len(failed) == len(chunks):
+            raise failed[0][1]
+        for chunk, error in failed:
+            logger.warning(f"Skipping {len(chunk)} markets whose chunk failed: {error}")
+        return {
+            info.market_id: info
+            for chunk in results if not isinstance(chunk, BaseException)
+            for info in chunk
+        }
+
+    async def _fetch_markets_chunk(self, market_ids: list[str]) -> list[MarketInfoDTO]:
+        url = f"{self.BASE_URL}/markets"
+        infos = []
+        offset = 0
+        try:
+            while True:
+                params = [("id", market_id) for market_id in market_ids]
+                params += [("limit", str(self.MARKETS_PAGE_LIMIT)), ("offset", str(offset))]
+                status, body, _ = await self._request("gamma", "GET", url, params=params)
+                if status != 200:
+                    logger.error(f"Failed to fetch {len(market_ids)} markets: HTTP {status}")
+                    raise MarketApiError(f"Failed to fetch markets: {status}")
+
+                page = payloads.decode_markets(body)
+                infos.extend(self._market_info(market, market.id) for market in page)
+                if len(page) < self.MARKETS_PAGE_LIMIT or len(infos) >= len(market_ids):
+                    return infos
+                offset += len(page)
+        except payloads.DecodeError as e:
+            logger.error(f"Malformed markets payload: {e}")
+            raise MarketApiError(f"Malformed markets payload: {e}")
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out fetching {len(market_ids)} markets")
+            raise MarketApiError("Request timed out")
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error fetching {len(market_ids)} markets: {e}")
+            raise MarketApiError(f"Network error: {str(e)}")
+
+    @staticmethod
+    def _market_info(market: payloads.GammaMarket, market_id: str) -> MarketInfoDTO:
+        return MarketInfoDTO(
+            title=market.question,
+            price=market.price(),
+            market_id=market_id,
+            slug=market.slug,
+            token_id=market.token_id,
+            closed=bool(market.closed),
+            end_date=market.end_datetime,
+        )
+
     async def get_prices_batch(self, token_ids: list[str]) -> dict[str, float]:
         """
         Fetch prices for multiple tokens in a single batch request.
-        Returns a dictionary mapping token_id to price.
+        Returns a dictionary mapping token_id to price, raises MarketApiError
+        once retries are exhausted or while the CLOB breaker is open.
         """
         if not token_ids:
             return {}
 
-        session = await self._get_session()
         url = f"{self.CLOB_API_URL}/prices"
-        
+
         # We request "SELL" side to get the Ask price (what we would pay to buy "Yes")
         # Matches logic in get_market_info which uses bestAsk
         payload = [{"token_id": tid, "side": "SELL"} for tid in token_ids]
-        
+
         try:
-            async with session.post(url, json=payload) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch batch prices: HTTP {response.status}")
-                    # Return empty dict on failure, or could raise error
-                    return {}
-                
-                data = await response.json()
-                # Data structure:
-                # { "token_id_1": { "BUY": "...", "SELL": "..." }, ... }
-                
-                prices = {}
-                for tid, price_data in data.items():
-                    try:
-                        # We requested SELL side, so look for SELL price
-                        sell_price = price_data.get("SELL")
-                        if sell_price:
-                            prices[tid] = float(sell_price)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not parse price for token {tid}: {price_data}")
-                
-                return prices
-                
+            # POST /prices only reads, so it is safe to retry
+            status, body, _ = await self._request("clob", "POST", url, json=payload)
+            if status != 200:
+                logger.error(f"Failed to fetch batch prices: HTTP {status}")
+                raise MarketApiError(f"Failed to fetch prices: {status}")
+
+            # { "token_id_1": { "BUY": "...", "SELL": "..." }, ... }
+            quotes = payloads.decode_prices(body)
+
+            prices = {}
+            for tid, quote in quotes.items():
+                # We requested SELL side, so look for SELL price
+                sell_price = payloads.to_float(quote.sell)
+                if sell_price:
+                    prices[tid] = sell_price
+                elif quote.sell:
+                    logger.warning(f"Could not parse price for token {tid}: {quote.sell}")
+
+            return prices
+
+        except payloads.DecodeError as e:
+            logger.error(f"Malformed batch prices payload: {e}")
+            raise MarketApiError(f"Malformed prices payload: {e}")
+        except asyncio.TimeoutError:
+            logger.error("Timed out fetching batch prices")
+            raise MarketApiError("Request timed out")
         except aiohttp.ClientError as e:
             logger.error(f"Network error fetching batch prices: {e}")
+            raise MarketApiError(f"Network error: {str(e)}")
+
+    async def get_quotes_batch(self, token_ids: list[str]) -> dict[str, QuoteDTO]:
+        """
+        Fetch best bid and ask for many tokens with one /books request.
+        Midpoint and spread derive from the same book, so every price kind
+        costs a single round trip. Raises MarketApiError like get_prices_batch.
+        """
+        if not token_ids:
             return {}
+
+        url = f"{self.CLOB_API_URL}/books"
+        payload = [{"token_id": tid} for tid in token_ids]
+
+        try:
+            # POST /books only reads, so it is safe to retry
+            status, body, _ = await self._request("clob", "POST", url, json=payload)
+            if status != 200:
+                logger.error(f"Failed to fetch order books: HTTP {status}")
+                raise MarketApiError(f"Failed to fetch order books: {status}")
+
+            return {
+                book.asset_id: QuoteDTO(bid=book.best_bid, ask=book.best_ask)
+                for book in payloads.decode_books(body)
+            }
+
+        except payloads.DecodeError as e:
+            logger.error(f"Malformed order books payload: {e}")
+            raise MarketApiError(f"Malformed order books payload: {e}")
+        except asyncio.TimeoutError:
+            logger.error("Timed out fetching order books")
+            raise MarketApiError("Request timed out")
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error fetching order books: {e}")
+            raise MarketApiError(f"Network error: {str(e)}")
@@ -0,0 +1,366 @@
+"""
+Local stand-in for the Polymarket gamma and CLOB APIs, for offline runs and load tests.
+
+    python -m src.infrastructure.polymarket.fake_server --port 8765 --markets 100000
+
+then point the bot at it with POLYMARKET_GAMMA_URL=http://127.0.0.1:8765,
+POLYMARKET_CLOB_URL=http://127.0.0.1:8765 and
+POLYMARKET_WS_URL=ws://127.0.0.1:8765/ws/market.
+
+It serves a synthetic catalog of `--markets` markets grouped into events of
+`--markets-per-event` (/events?slug=synthetic-event-0, /markets/{id}, /markets),
+/prices and /books, and the websocket market channel. Markets are derived from
+their index on demand, so the catalog size costs no memory; prices start at a
+value derived from the token id and random-walk every `--interval` seconds
+once a token has been asked for.
+
+REST responses can be made to fail: `--error-rate` answers that share of
+requests with a 503, `--throttle-rate` with a 429 carrying Retry-After, and
+`--latency` (plus up to `--jitter`) delays every response. POST the same
+fields as JSON to /faults to change them while the server runs.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+PRICES_KEY = web.AppKey("prices", dict)
+CLIENTS_KEY = web.AppKey("clients", dict)
+
+
+@dataclass
+class Faults:
+    error_rate: float = 0.0  # share of requests answered with 503
+    throttle_rate: float = 0.0  # share of requests answered with 429
+    retry_after: float = 1.0  # Retry-After sent with 429s
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # up to this many extra seconds, drawn per response
+
+
+FAULTS_KEY = web.AppKey("faults", Faults)
+
+
+class Catalog:
+    """Deterministic synthetic gamma markets, built from their index on every request."""
+
+    FIRST_MARKET_ID = 500_000
+    EVENT_SLUG_PREFIX = "synthetic-event-"
+
+    def __init__(self, markets: int = 10_000, markets_per_event: int = 10, closed_rate: float = 0.05, seed: int = 0):
+        self.markets = markets
+        self.markets_per_event = max(1, markets_per_event)
+        self.closed_rate = closed_rate
+        self.seed = seed
+        self._epoch = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    @property
+    def events(self) -> int:
+        return -(-self.markets // self.markets_per_event)
+
+    def _digest(self, *parts) -> int:
+        key = ":".join(str(part) for part in (self.seed, *parts)).encode()
+        return int.from_bytes(hashlib.blake2b(key, digest_size=32).digest(), "big")
+
+    def index(self, market_id: str) -> int | None:
+        try:
+            index = int(market_id) - self.FIRST_MARKET_ID
+        except ValueError:
+            return None
+        return index if 0 <= index < self.markets else None
+
+    def market_id(self, index: int) -> str:
+        return str(self.FIRST_MARKET_ID + index)
+
+    def token_ids(self, index: int) -> tuple[str, str]:
+        # Real token ids are 256-bit integers written out in decimal
+        return str(self._digest("token", index, "yes")), str(self._digest("token", index, "no"))
+
+    def initial_price(self, token_id: str) -> float:
+        return round(0.05 + (self._digest("price", token_id) % 900) / 1000, 3)
+
+    def market(self, index: int, prices: dict[str, float]) -> dict:
+        market_id = self.market_id(index)
+        yes_token, no_token = self.token_ids(index)
+        price = prices.get(yes_token) or self.initial_price(yes_token)
+        digest = self._digest("market", index)
+        return {
+            "id": market_id,
+            "question": f"Will synthetic outcome #{market_id} happen?",
+            "conditionId": f"0x{digest:064x}",
+            "slug": f"synthetic-market-{market_id}",
+            "description": f"Synthetic market {market_id} served by the local Polymarket stand-in.",
+            "endDate": (self._epoch + timedelta(days=digest % 365)).isoformat().replace("+00:00", "Z"),
+            "active": True,
+            "closed": (digest % 10_000) / 10_000 < self.closed_rate,
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": json.dumps([f"{price:.3f}", f"{1 - price:.3f}"]),
+            "clobTokenIds": json.dumps([yes_token, no_token]),
+            "bestBid": round(max(0.01, price - 0.01), 3),
+            "bestAsk": price,
+            "lastTradePrice": price,
+            "volume": str(digest % 1_000_000),
+            "liquidity": str(digest % 100_000),
+        }
+
+    def event(self, slug: str, prices: dict[str, float]) -> dict | None:
+        if not slug.startswith(self.EVENT_SLUG_PREFIX):
+            return None
+        try:
+            number = int(slug[len(self.EVENT_SLUG_PREFIX):])
+        except ValueError:
+            return None
+        if not 0 <= number < self.events:
+            return None
+
+        first = number * self.markets_per_event
+        last = min(self.markets, first + self.markets_per_event)
+        return {
+            "id": str(number + 1),
+            "slug": slug,
+            "title": f"Synthetic event #{number}",
+            "active": True,
+            "closed": False,
+            "markets": [self.market(index, prices) for index in range(first, last)],
+        }
+
+
+CATALOG_KEY = web.AppKey("catalog", Catalog)
+
+
+def _tick(price: float, rng: random.Random) -> float:
+    return round(min(0.99, max(0.01, price + rng.uniform(-0.02, 0.02))), 3)
+
+
+def _book_event(asset_id: str, price: float) -> dict:
+    return {
+        "event_type": "book",
+        "asset_id": asset_id,
+        "bids": [{"price": f"{max(0.01, price - 0.01):.3f}", "size": "100"}],
+        "asks": [{"price": f"{price:.3f}", "size": "100"}],
+        "timestamp": str(int(time.time() * 1000)),
+    }
+
+
+def _price_change_event(changes: dict[str, float]) -> dict:
+    return {
+        "event_type": "price_change",
+        "price_changes": [
+            {
+                "asset_id": asset_id,
+                "price": f"{price:.3f}",
+                "side": "SELL",
+                "best_bid": f"{max(0.01, price - 0.01):.3f}",
+                "best_ask": f"{price:.3f}",
+            }
+            for asset_id, price in changes.items()
+        ],
+        "timestamp": str(int(time.time() * 1000)),
+    }
+
+
+async def market_channel(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+
+    clients: dict[web.WebSocketResponse, set[str]] = request.app[CLIENTS_KEY]
+    subscribed = clients[ws] = set()
+
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            if msg.data == "PING":
+                await ws.send_str("PONG")
+                continue
+
+            payload = json.loads(msg.data)
+            asset_ids = payload.get("assets_ids", [])
+            if payload.get("operation") == "unsubscribe":
+                subscribed.difference_update(asset_ids)
+                continue
+
+            subscribed.update(asset_ids)
+            for asset_id in asset_ids:
+                price = _price(request.app, asset_id)
+                await ws.send_json([_book_event(asset_id, price)])
+    finally:
+        clients.pop(ws, None)
+    return ws
+
+
+@web.middleware
+async def inject_faults(request: web.Request, handler):
+    if request.path.startswith("/ws") or request.path == "/faults":
+        return await handler(request)
+
+    faults = request.app[FAULTS_KEY]
+    delay = faults.latency + (random.uniform(0, faults.jitter) if faults.jitter else 0.0)
+    if delay:
+        await asyncio.sleep(delay)
+    roll = random.random()
+    if roll < faults.error_rate:
+        return web.json_response({"error": "injected failure"}, status=503)
+    if roll < faults.error_rate + faults.throttle_rate:
+        return web.json_response(
+            {"error": "rate limited"}, status=429, headers={"Retry-After": f"{faults.retry_after:g}"}
+        )
+    return await handler(request)
+
+
+def _price(app: web.Application, token_id: str) -> float:
+    """Current price of a token, which joins the random walk from now on."""
+    prices = app[PRICES_KEY]
+    price = prices.get(token_id)
+    if price is None:
+        price = prices[token_id] = app[CATALOG_KEY].initial_price(token_id)
+    return price
+
+
+def _json_response(request: web.Request, body) -> web.Response:
+    """JSON response with an ETag, or a bare 304 when the client's copy matches."""
+    data = json.dumps(body).encode()
+    etag = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    return web.Response(body=data, content_type="application/json", headers={"ETag": etag})
+
+
+async def events(request: web.Request) -> web.Response:
+    event = request.app[CATALOG_KEY].event(request.query.get("slug", ""), request.app[PRICES_KEY])
+    return _json_response(request, [event] if event else [])
+
+
+async def market(request: web.Request) -> web.Response:
+    catalog = request.app[CATALOG_KEY]
+    index = catalog.index(request.match_info["market_id"])
+    if index is None:
+        return web.json_response({"error": "market not found"}, status=404)
+    return _json_response(request, catalog.market(index, request.app[PRICES_KEY]))
+
+
+async def markets(request: web.Request) -> web.Response:
+    catalog = request.app[CATALOG_KEY]
+    limit = min(int(request.query.get("limit", 100)), 500)
+    offset = int(request.query.get("offset", 0))
+
+    ids = request.query.getall("id", [])
+    if ids:
+        indexes = [index for index in map(catalog.index, dict.fromkeys(ids)) if index is not None]
+        page = indexes[offset:offset + limit]
+    else:
+        page = range(offset, min(catalog.markets, offset + limit))
+    return _json_response(request, [catalog.market(index, request.app[PRICES_KEY]) for index in page])
+
+
+async def prices(request: web.Request) -> web.Response:
+    body = {}
+    for item in await request.json():
+        price = _price(request.app, item["token_id"])
+        body[item["token_id"]] = {item.get("side", "SELL"): f"{price:.3f}"}
+    return web.json_response(body)
+
+
+async def books(request: web.Request) -> web.Response:
+    body = []
+    for item in await request.json():
+        price = _price(request.app, item["token_id"])
+        book = _book_event(item["token_id"], price)
+        del book["event_type"]
+        body.append(book)
+    return web.json_response(body)
+
+
+async def update_faults(request: web.Request) -> web.Response:
+    faults = request.app[FAULTS_KEY]
+    for name, value in (await request.json()).items():
+        if hasattr(faults, name):
+            setattr(faults, name, float(value))
+    logger.info(f"Faults set to {faults}")
+    return web.json_response(asdict(faults))
+
+
+async def _random_walk(app: web.Application, interval: float, seed: int | None):
+    rng = random.Random(seed)
+    prices = app[PRICES_KEY]
+    while True:
+        await asyncio.sleep(interval)
+        for asset_id in list(prices):
+            prices[asset_id] = _tick(prices[asset_id], rng)
+
+        for ws, subscribed in list(app[CLIENTS_KEY].items()):
+            changes = {asset_id: prices[asset_id] for asset_id in subscribed if asset_id in prices}
+            if changes and not ws.closed:
+                await ws.send_json(_price_change_event(changes))
+
+
+async def _close_clients(app: web.Application):
+    for ws in list(app[CLIENTS_KEY]):
+        await ws.close()
+
+
+def create_app(
+    interval: float = 1.0,
+    seed: int | None = None,
+    faults: Faults | None = None,
+    catalog: Catalog | None = None,
+) -> web.Application:
+    app = web.Application(middlewares=[inject_faults])
+    app[PRICES_KEY] = {}
+    app[CLIENTS_KEY] = {}
+    app[FAULTS_KEY] = faults or Faults()
+    app[CATALOG_KEY] = catalog or Catalog(seed=seed or 0)
+    app.router.add_get("/ws/market", market_channel)
+    app.router.add_get("/events", events)
+    app.router.add_get("/markets", markets)
+    app.router.add_get("/markets/{market_id}", market)
+    app.router.add_post("/prices", prices)
+    app.router.add_post("/books", books)
+    app.router.add_post("/faults", update_faults)
+
+    async def walker(app: web.Application):
+        task = asyncio.create_task(_random_walk(app, interval, seed))
+        yield
+        task.cancel()
+
+    app.cleanup_ctx.append(walker)
+    app.on_shutdown.append(_close_clients)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Polymarket gamma and CLOB APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between price updates")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--markets", type=int, default=10_000, help="size of the synthetic catalog")
+    parser.add_argument("--markets-per-event", type=int, default=10)
+    parser.add_argument("--closed-rate", type=float, default=0.05, help="share of markets reported as closed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of REST requests failing with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of REST requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every REST response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    args = parser.parse_args()
+
+    faults = Faults(args.error_rate, args.throttle_rate, args.retry_after, args.latency, args.jitter)
+    catalog = Catalog(args.markets, args.markets_per_event, args.closed_rate, args.seed or 0)
+    logging.basicConfig(level=logging.INFO)
+    logger.info(
+        f"Serving {catalog.markets} markets in {catalog.events} events, "
+        f"e.g. https://polymarket.com/event/{Catalog.EVENT_SLUG_PREFIX}0"
+    )
+    web.run_app(create_app(args.interval, args.seed, faults, catalog), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Typed views of the Polymarket REST payloads.
+
+Responses are decoded straight from bytes into structs that declare only the
+fields the bot reads; everything else in the (large) gamma objects is skipped
+by the decoder without allocating Python objects for it.
+"""
+import logging
+from datetime import datetime
+
+import msgspec
+
+logger = logging.getLogger(__name__)
+
+# Gamma sometimes returns numbers as strings and vice versa
+Number = float | str | None
+# Several list fields are JSON documents encoded inside a string
+EncodedList = str | list
+
+
+class GammaMarket(msgspec.Struct, rename="camel"):
+    id: str
+    question: str = "Unknown Market"
+    slug: str | None = None
+    active: bool = True
+    closed: bool | None = None
+    end_date: str | None = None
+    clob_token_ids: EncodedList = "[]"
+    outcome_prices: EncodedList = "[]"
+    outcomes: EncodedList = "[]"
+    best_ask: Number = None
+    yes_price: Number = None
+    current_price: Number = None
+    last_trade_price: Number = None
+
+    @property
+    def token_id(self) -> str | None:
+        token_ids = decode_list(self.clob_token_ids)
+        return str(token_ids[0]) if token_ids else None
+
+    @property
+    def end_datetime(self) -> datetime | None:
+        if not self.end_date:
+            return None
+        try:
+            return datetime.fromisoformat(self.end_date.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    def price(self) -> float:
+        """Best guess at the Yes price, 0.0 when the payload has none."""
+        # A zero price means "no quote", so keep looking
+        if price := to_float(self.best_ask):
+            return price
+
+        outcome_prices = decode_list(self.outcome_prices)
+        if outcome_prices and (price := to_float(outcome_prices[0])):
+            return price
+
+        for outcome in decode_list(self.outcomes):
+            if isinstance(outcome, dict) and "yes" in str(outcome.get("name", "")).lower():
+                raw = outcome.get("price") or outcome.get("currentPrice") or outcome.get("lastPrice")
+                if price := to_float(raw):
+                    return price
+                break
+
+        for raw in (self.yes_price, self.current_price, self.last_trade_price):
+            if raw is not None:
+                return to_float(raw) or 0.0
+        return 0.0
+
+
+class GammaEventMarket(msgspec.Struct):
+    id: str
+    question: str = "Unknown Question"
+    active: bool = True
+    closed: bool | None = None
+
+
+class GammaEvent(msgspec.Struct):
+    markets: list[GammaEventMarket] = []
+
+
+class ClobPrice(msgspec.Struct, rename={"sell": "SELL", "buy": "BUY"}):
+    sell: Number = None
+    buy: Number = None
+
+
+class ClobLevel(msgspec.Struct):
+    price: Number = None
+
+
+class ClobBook(msgspec.Struct):
+    asset_id: str
+    bids: list[ClobLevel] = []
+    asks: list[ClobLevel] = []
+
+    @property
+    def best_bid(self) -> float | None:
+        return max((p for level in self.bids if (p := to_float(level.price)) is not None), default=None)
+
+    @property
+    def best_ask(self) -> float | None:
+        return min((p for level in self.asks if (p := to_float(level.price)) is not None), default=None)
+
+
+_market_decoder = msgspec.json.Decoder(GammaMarket)
+_markets_decoder = msgspec.json.Decoder(list[GammaMarket])
+_events_decoder = msgspec.json.Decoder(list[GammaEvent])
+_prices_decoder = msgspec.json.Decoder(dict[str, ClobPrice])
+_books_decoder = msgspec.json.Decoder(list[ClobBook])
+_list_decoder = msgspec.json.Decoder(list)
+
+DecodeError = (msgspec.DecodeError, msgspec.ValidationError)
+
+
+def decode_market(body: bytes) -> GammaMarket:
+    return _market_decoder.decode(body)
+
+
+def decode_markets(body: bytes) -> list[GammaMarket]:
+    return _markets_decoder.decode(body)
+
+
+def decode_events(body: bytes) -> list[GammaEvent]:
+    return _events_decoder.decode(body)
+
+
+def decode_prices(body: bytes) -> dict[str, ClobPrice]:
+    return _prices_decoder.decode(body)
+
+
+def decode_books(body: bytes) -> list[ClobBook]:
+    return _books_decoder.decode(body)
+
+
+def decode_list(value: EncodedList) -> list:
+    if isinstance(value, list):
+        return value
+    try:
+        return _list_decoder.decode(value)
+    except DecodeError:
+        logger.warning(f"Could not decode embedded list: {value[:100]}")
+        return []
+
+
+def to_float(value) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
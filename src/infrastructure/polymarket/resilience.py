@@ -0,0 +1,128 @@
+import enum
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from src.infrastructure import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, enum.Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+_STATE_VALUES = {BreakerState.CLOSED: 0, BreakerState.HALF_OPEN: 1, BreakerState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Stops calling a host after `failure_threshold` consecutive failures.
+
+    After `recovery_seconds` in the open state a single probe request is let
+    through (another one every `recovery_seconds` if it never reports back);
+    a success closes the breaker again, a failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_at = -math.inf
+        metrics.POLYMARKET_BREAKER_STATE.labels(name).set(_STATE_VALUES[self._state])
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and self.retry_in == 0:
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being short-circuited."""
+        return self.state == BreakerState.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a probe through."""
+        if self._state != BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        now = time.monotonic()
+        if state == BreakerState.HALF_OPEN and now - self._probe_at >= self.recovery_seconds:
+            self._probe_at = now
+            return True
+        return False
+
+    def record_success(self):
+        self._failures = 0
+        if self._state != BreakerState.CLOSED:
+            self._transition(BreakerState.CLOSED)
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self._state != BreakerState.OPEN:
+                self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState):
+        if state == BreakerState.OPEN:
+            logger.warning(f"Circuit breaker for {self.name} opened, pausing calls for {self.recovery_seconds}s")
+        else:
+            logger.info(f"Circuit breaker for {self.name} is {state.value}")
+        self._state = state
+        self._probe_at = -math.inf
+        metrics.POLYMARKET_BREAKER_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 3  # including the first try
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """
+        Seconds to wait before retry number `attempt` (1-based), None to give up.
+
+        A server-provided Retry-After wins over the jittered exponential backoff,
+        but one longer than `max_delay` is not worth waiting for.
+        """
+        if attempt >= self.attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
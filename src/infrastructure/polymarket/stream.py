@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+
+from src.domain.entities.market import QuoteDTO
+
+logger = logging.getLogger(__name__)
+
+PricesCallback = Callable[[dict[str, QuoteDTO]], Awaitable[None]]
+
+
+class PolymarketPriceStream:
+    """
+    Long-lived subscriber to the CLOB websocket market channel.
+
+    Keeps the subscribed asset set in sync with `set_tokens`, reconnects with
+    backoff and reports best bid / best ask quotes (0.0-1.0) to `on_prices`,
+    the same prices `PolymarketApiClient.get_quotes_batch` polls. The
+    stream only counts as `live` while market events keep arriving: a socket
+    that stays open but goes quiet for `stale_seconds` does not.
+    """
+
+    WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+    def __init__(
+        self,
+        on_prices: PricesCallback,
+        url: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        ping_interval: float = 10.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        stale_seconds: float = 60.0,
+    ):
+        self.on_prices = on_prices
+        self.url = url or self.WS_URL
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.stale_seconds = stale_seconds
+
+        self._session = session
+        self._owns_session = False
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._tokens: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._tokens_ready = asyncio.Event()
+        self._last_event_at: Optional[float] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def live(self) -> bool:
+        """Connected and a market event arrived within `stale_seconds`."""
+        return (
+            self.connected
+            and self._last_event_at is not None
+            and time.monotonic() - self._last_event_at <= self.stale_seconds
+        )
+
+    async def start(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_session and self._session:
+            await self._session.close()
+            self._session = None
+
+    async def set_tokens(self, token_ids: set[str]):
+        added = token_ids - self._tokens
+        removed = self._tokens - token_ids
+        self._tokens = set(token_ids)
+        if self._tokens:
+            self._tokens_ready.set()
+        else:
+            self._tokens_ready.clear()
+
+        if not self.connected:
+            # The full set is sent on (re)connect.
+            return
+        try:
+            if added:
+                await self._ws.send_json({"assets_ids": sorted(added), "operation": "subscribe"})
+            if removed:
+                await self._ws.send_json({"assets_ids": sorted(removed), "operation": "unsubscribe"})
+        except (aiohttp.ClientError, ConnectionResetError) as e:
+            logger.warning(f"Failed to update stream subscriptions: {e}")
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            # No point holding a connection open with nothing to listen to.
+            await self._tokens_ready.wait()
+            try:
+                async with self._session.ws_connect(self.url, heartbeat=None) as ws:
+                    self._ws = ws
+                    self._last_event_at = None
+                    await ws.send_json({"assets_ids": sorted(self._tokens), "type": "market"})
+                    logger.info(f"Price stream connected, {len(self._tokens)} tokens subscribed")
+                    delay = self.reconnect_delay
+                    await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Price stream error: {e}")
+            finally:
+                self._ws = None
+
+            logger.warning(f"Price stream disconnected, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _consume(self, ws: aiohttp.ClientWebSocketResponse):
+        pinger = asyncio.create_task(self._ping(ws))
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    if msg.data != "PONG":
+                        self._last_event_at = time.monotonic()
+                    prices = self._parse_message(msg.data)
+                    if prices:
+                        try:
+                            await self.on_prices(prices)
+                        except Exception as e:
+                            logger.error(f"Error handling streamed prices: {e}")
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+        finally:
+            pinger.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await pinger
+
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse):
+        # The market channel expects an application level PING text frame.
+        while not ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await ws.send_str("PING")
+            except (aiohttp.ClientError, ConnectionResetError) as e:
+                # Half-closed socket, the read loop sees the close and reconnects
+                logger.warning(f"Price stream ping failed: {e}")
+                return
+
+    def _parse_message(self, raw: str) -> dict[str, QuoteDTO]:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            # PONG and other plain text frames
+            return {}
+
+        events = data if isinstance(data, list) else [data]
+        prices: dict[str, QuoteDTO] = {}
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            try:
+                self._collect_prices(event, prices)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Could not parse stream event {event.get('event_type')}: {e}")
+        return {tid: price for tid, price in prices.items() if tid in self._tokens}
+
+    @staticmethod
+    def _collect_prices(event: dict, prices: dict[str, QuoteDTO]):
+        event_type = event.get("event_type")
+
+        if event_type == "book":
+            bids = event.get("bids") or []
+            asks = event.get("asks") or []
+            if bids or asks:
+                prices[event["asset_id"]] = QuoteDTO(
+                    bid=max((float(b["price"]) for b in bids), default=None),
+                    ask=min((float(a["price"]) for a in asks), default=None),
+                )
+        elif event_type == "price_change":
+            for change in event.get("price_changes", []):
+                if change.get("best_bid") or change.get("best_ask"):
+                    prices[change["asset_id"]] = _quote(change)
+        elif event_type == "best_bid_ask":
+            if event.get("best_bid") or event.get("best_ask"):
+                prices[event["asset_id"]] = _quote(event)
+
+
+def _quote(data: dict) -> QuoteDTO:
+    return QuoteDTO(
+        bid=float(data["best_bid"]) if data.get("best_bid") else None,
+        ask=float(data["best_ask"]) if data.get("best_ask") else None,
+    )
@@ -0,0 +1,90 @@
+import math
+from dataclasses import dataclass
+
+# (max distance to the nearest target in points, seconds between fetches)
+DEFAULT_TIERS: tuple[tuple[float, float], ...] = (
+    (2.0, 5.0),
+    (5.0, 15.0),
+    (15.0, 60.0),
+    (math.inf, 300.0),
+)
+
+
+@dataclass
+class _TokenCadence:
+    last_price: float
+    volatility: float  # moving average of the absolute move per fetch, in points
+    interval: float
+    next_due: float
+
+
+class CadencePlanner:
+    """
+    Decides how often each token is polled.
+
+    A token's tier comes from the distance between its price and the closest
+    untriggered target, shrunk by how much the price has been moving lately.
+    Tokens near a trigger are fetched every few seconds, far-away ones every
+    few minutes. Tokens never seen before, or whose targets changed since the
+    last fetch, are always due.
+    """
+
+    # How many typical moves are subtracted from the distance
+    VOLATILITY_WEIGHT = 3.0
+    # Weight of the newest sample in the volatility moving average
+    VOLATILITY_SMOOTHING = 0.2
+
+    def __init__(self, tiers: tuple[tuple[float, float], ...] = DEFAULT_TIERS):
+        self.tiers = tiers
+        self._tokens: dict[str, _TokenCadence] = {}
+
+    @property
+    def tick_seconds(self) -> float:
+        """How often the monitor has to wake up to serve the fastest tier."""
+        return min(interval for _, interval in self.tiers)
+
+    def due(self, token_ids: list[str], now: float) -> list[str]:
+        active = set(token_ids)
+        for token_id in [t for t in self._tokens if t not in active]:
+            del self._tokens[token_id]
+        return [
+            token_id for token_id in token_ids
+            if token_id not in self._tokens or self._tokens[token_id].next_due <= now
+        ]
+
+    def observe(self, token_id: str, current_price: float, distance: float | None, now: float):
+        """Record a fetched price (0-100) and schedule the token's next fetch."""
+        state = self._tokens.get(token_id)
+        if state is None:
+            volatility = 0.0
+        else:
+            move = abs(current_price - state.last_price)
+            volatility = state.volatility + self.VOLATILITY_SMOOTHING * (move - state.volatility)
+
+        interval = self._interval_for(distance, volatility)
+        self._tokens[token_id] = _TokenCadence(
+            last_price=current_price,
+            volatility=volatility,
+            interval=interval,
+            next_due=now + interval,
+        )
+
+    def invalidate(self, token_id: str):
+        """Forget the token's schedule, e.g. after a target changed, so it is due at once."""
+        self._tokens.pop(token_id, None)
+
+    def tier_counts(self) -> dict[float, int]:
+        counts = {interval: 0 for _, interval in self.tiers}
+        for state in self._tokens.values():
+            counts[state.interval] += 1
+        return counts
+
+    def _interval_for(self, distance: float | None, volatility: float) -> float:
+        if distance is None:
+            # Nothing left to trigger on this token
+            return self.tiers[-1][1]
+        effective = max(0.0, distance - self.VOLATILITY_WEIGHT * volatility)
+        for max_distance, interval in self.tiers:
+            if effective <= max_distance:
+                return interval
+        return self.tiers[-1][1]
@@ -1,101 +1,329 @@
 import asyncio
 import logging
-from typing import List
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
-from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_SUBMITTED, JobEvent, JobSubmissionEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
 from fluentogram import TranslatorHub
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from src.domain.entities.market import MarketDTO, MarketCondition
+from src.domain.entities.market import ActiveMarketDTO, MarketDTO, PriceSource, QuoteDTO
+from src.domain.exceptions import PolymarketUnavailableError
 from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+from src.infrastructure import metrics
+from src.infrastructure.notifications.dispatcher import Notification, NotificationDispatcher
 from src.infrastructure.polymarket.client import PolymarketApiClient
+from src.infrastructure.polymarket.stream import PolymarketPriceStream
+from src.infrastructure.scheduler.cadence import CadencePlanner
+from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+from src.infrastructure.sharding.coordinator import ShardCoordinator
 
 logger = logging.getLogger(__name__)
 
+CHECK_MARKETS_JOB_ID = "check_markets"
+
+
+@dataclass
+class TickStats:
+    ticks: int = 0
+    skipped: int = 0  # runs dropped because the previous tick was still running
+    overruns: int = 0  # ticks that ran out of budget and carried tokens over
+    carried_over: int = 0  # tokens waiting for the next tick
+    backed_off: int = 0  # ticks not polled because the Polymarket breaker was open
+    last_lag: float = 0.0  # seconds between the scheduled and actual start
+    last_duration: float = 0.0
+
+
 class MarketMonitorService:
     def __init__(
         self,
         session_maker: async_sessionmaker,
         polymarket_api: PolymarketApiClient,
-        bot: Bot,
+        notifier: NotificationDispatcher,
         scheduler: AsyncIOScheduler,
         translator_hub: TranslatorHub,
+        registry: ActiveMarketRegistry,
+        chunk_size: int = 20,
+        fetch_concurrency: int = 5,
+        streaming: bool = False,
+        stream_url: str | None = None,
+        stream_stale_seconds: float = 60.0,
+        reconcile_seconds: int = 300,
+        interval_seconds: int = 60,
+        tick_jitter_seconds: int = 2,
+        tick_budget_seconds: float = 45.0,
+        adaptive_cadence: bool = False,
+        shard: ShardCoordinator | None = None,
     ):
         self.session_maker = session_maker
         self.polymarket_api = polymarket_api
-        self.bot = bot
+        self.notifier = notifier
         self.scheduler = scheduler
         self.translator_hub = translator_hub
+        self.registry = registry
+        self.chunk_size = chunk_size
+        self.fetch_concurrency = fetch_concurrency
+        self.reconcile_seconds = reconcile_seconds
+        self.interval_seconds = interval_seconds
+        self.tick_jitter_seconds = tick_jitter_seconds
+        self.tick_budget_seconds = tick_budget_seconds
+        self.stats = TickStats()
+        self.cadence = CadencePlanner() if adaptive_cadence else None
+        self.shard = shard
+        # Tokens the previous tick ran out of budget for, fetched first next time
+        self._carry_over: list[str] = []
+        self.price_stream = (
+            PolymarketPriceStream(self._on_stream_prices, url=stream_url, stale_seconds=stream_stale_seconds)
+            if streaming
+            else None
+        )
+
+        if self.cadence:
+            # A new or moved target may be much closer than the tier the token sits in
+            self.registry.add_targets_listener(self.cadence.invalidate)
+        if self.price_stream:
+            self.registry.add_tokens_listener(self._sync_stream_tokens)
+            if self.shard:
+                self.shard.add_rebalance_listener(self._sync_stream_tokens)
 
     async def start(self):
-        self.scheduler.add_job(self.check_markets, "interval", seconds=60)
+        await self.registry.load()
+        if self.cadence:
+            # Wake up at the pace of the fastest tier, each tick only fetches due tokens
+            self.interval_seconds = self.cadence.tick_seconds
+            self.tick_budget_seconds = min(self.tick_budget_seconds, self.interval_seconds)
+
+        # Ticks are aligned to wall-clock multiples of the interval, so they do
+        # not drift with restarts, and never overlap: a run that would start
+        # while the previous one is still going is skipped and counted.
+        self.scheduler.add_job(
+            self.check_markets,
+            IntervalTrigger(
+                seconds=self.interval_seconds,
+                start_date=self._next_boundary(),
+                jitter=self.tick_jitter_seconds,
+            ),
+            id=CHECK_MARKETS_JOB_ID,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=self.interval_seconds,
+        )
+        self.scheduler.add_listener(self._on_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES)
+        self.scheduler.add_job(self.registry.reconcile, "interval", seconds=self.reconcile_seconds)
+        if self.shard:
+            await self.shard.start()
+        if self.price_stream:
+            await self._sync_stream_tokens()
+            await self.price_stream.start()
         self.scheduler.start()
 
+    async def stop(self):
+        if self.price_stream:
+            await self.price_stream.stop()
+        if self.shard:
+            await self.shard.stop()
+
+    def _owned_tokens(self) -> list[str]:
+        token_ids = self.registry.index.token_ids
+        if self.shard:
+            token_ids = self.shard.filter(token_ids)
+        return token_ids
+
+    async def _sync_stream_tokens(self, *_):
+        await self.price_stream.set_tokens(set(self._owned_tokens()))
+
+    def _next_boundary(self) -> datetime:
+        now = time.time()
+        return datetime.fromtimestamp(now - now % self.interval_seconds + self.interval_seconds, tz=timezone.utc)
+
+    def _on_job_event(self, event: JobEvent):
+        if event.job_id != CHECK_MARKETS_JOB_ID:
+            return
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            self.stats.skipped += 1
+            metrics.MONITOR_TICKS_SKIPPED.inc()
+            logger.warning("Previous market check is still running, skipping this tick")
+        elif isinstance(event, JobSubmissionEvent) and event.scheduled_run_times:
+            scheduled = event.scheduled_run_times[-1]
+            self.stats.last_lag = (datetime.now(scheduled.tzinfo) - scheduled).total_seconds()
+            metrics.MONITOR_TICK_LAG.set(self.stats.last_lag)
+
     async def check_markets(self):
         logger.info("Checking markets...")
-        
-        async with self.session_maker() as session:
-            market_repo = SQLAlchemyMarketRepository(session)
-            active_markets = await market_repo.get_active_markets()
-            
-            if not active_markets:
-                return
-
-            # Group markets by token_id for batch processing
-            # Since we enforce token_id, we can skip any (legacy) records that might still miss it
-            # or treat them as error cases, but relying on batch API.
-            markets_with_token = [m for m in active_markets if m.token_id]
-            
-            if len(markets_with_token) < len(active_markets):
-                logger.warning(f"Found {len(active_markets) - len(markets_with_token)} active markets without token_id. Skipping them.")
-            
-            if not markets_with_token:
-                return
-
-            unique_tokens = list({m.token_id for m in markets_with_token})
-            logger.info(f"Fetching prices for {len(unique_tokens)} tokens (Batch)")
-            
-            # Split into chunks of 20
-            chunk_size = 20
-            for i in range(0, len(unique_tokens), chunk_size):
-                chunk_tokens = unique_tokens[i:i + chunk_size]
-                
+
+        if self.price_stream and self.price_stream.live:
+            logger.info("Price stream is live, skipping poll")
+            return
+
+        if not self.polymarket_api.prices_available:
+            # Upstream is unhealthy, leave it alone until the breaker lets a probe through
+            self.stats.backed_off += 1
+            metrics.MONITOR_TICKS_BACKED_OFF.inc()
+            logger.warning("Polymarket prices are unavailable, backing off this tick")
+            return
+
+        started = time.monotonic()
+        self.stats.ticks += 1
+        try:
+            await self._poll_prices()
+        finally:
+            self.stats.last_duration = time.monotonic() - started
+            metrics.MONITOR_TICK_SECONDS.observe(self.stats.last_duration)
+            metrics.MONITOR_ACTIVE_MARKETS.set(len(self.registry.index))
+
+    async def _poll_prices(self):
+        index = self.registry.index
+        carried = [t for t in self._carry_over if index.has_token(t)]
+        if self.shard:
+            carried = self.shard.filter(carried)
+        carried_set = set(carried)
+        token_ids = self._owned_tokens()
+        if self.cadence:
+            token_ids = self.cadence.due(token_ids, time.monotonic())
+        unique_tokens = carried + [t for t in token_ids if t not in carried_set]
+        self._carry_over = []
+        metrics.MONITOR_TICK_TOKENS.set(len(unique_tokens))
+        metrics.MONITOR_TICK_MARKETS.set(sum(index.market_count(t) for t in unique_tokens))
+        if not unique_tokens:
+            return
+        logger.info(f"Fetching prices for {len(unique_tokens)} tokens (Batch), {len(carried)} carried over")
+
+        chunks = [
+            unique_tokens[i:i + self.chunk_size]
+            for i in range(0, len(unique_tokens), self.chunk_size)
+        ]
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        tasks = {
+            asyncio.create_task(self._fetch_chunk(chunk, semaphore)): chunk
+            for chunk in chunks
+        }
+
+        # Evaluate each chunk as soon as it arrives, but disable everything
+        # the tick triggered in one transaction at the end
+        triggered = []
+        pending = set(tasks)
+        deadline = time.monotonic() + self.tick_budget_seconds
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                quotes = task.result()
+                if quotes is None:
+                    # Short-circuited by the breaker, try these tokens first next tick
+                    self._carry_over.extend(tasks[task])
+                    continue
+                if not quotes:
+                    continue
                 try:
-                    prices = await self.polymarket_api.get_prices_batch(chunk_tokens)
-                    
-                    for market in markets_with_token:
-                        if market.token_id in chunk_tokens:
-                            if market.token_id in prices:
-                                current_price = prices[market.token_id] * 100
-                                await self._check_and_notify(market, current_price, market_repo)
-                            else:
-                                # This might happen if API didn't return price for valid token
-                                pass 
+                    triggered.extend(self._collect_triggered(quotes))
+                    if self.cadence:
+                        self._reschedule(quotes)
                 except Exception as e:
                     logger.error(f"Error processing batch: {e}")
 
-    async def _check_and_notify(self, market: MarketDTO, current_price: float, market_repo: SQLAlchemyMarketRepository):
-        logger.debug(f"Checking market {market.id} ({market.market_id}): current_price={current_price}%, target={market.target_price}%, condition={market.condition}")
-        should_notify = False
-        
-        if market.condition == MarketCondition.LE and current_price <= market.target_price:
-            should_notify = True
-            logger.info(f"Market {market.id} triggered (LE): {current_price}% <= {market.target_price}%")
-        elif market.condition == MarketCondition.GE and current_price >= market.target_price:
-            should_notify = True
-            logger.info(f"Market {market.id} triggered (GE): {current_price}% >= {market.target_price}%")
-            
-        if should_notify:
-            await self.notify_and_disable(market, current_price, market_repo)
-
-    async def notify_and_disable(self, market: MarketDTO, current_price: float, market_repo: SQLAlchemyMarketRepository):
+        if pending:
+            for task in pending:
+                task.cancel()
+                self._carry_over.extend(tasks[task])
+            self.stats.overruns += 1
+            metrics.MONITOR_TICK_OVERRUNS.inc()
+            logger.warning(
+                f"Tick budget of {self.tick_budget_seconds}s exhausted, "
+                f"carrying {len(self._carry_over)} tokens over to the next tick"
+            )
+        self.stats.carried_over = len(self._carry_over)
+
+        await self._flush_triggered(triggered)
+
+    def _reschedule(self, quotes: dict[str, QuoteDTO]):
+        # Runs after triggered markets left the index, so the distance is to
+        # the closest target that can still fire
+        now = time.monotonic()
+        index = self.registry.index
+        for token_id, quote in quotes.items():
+            if quote.reference is None:
+                continue
+            distance = index.distance_to_nearest(token_id, quote)
+            self.cadence.observe(token_id, quote.reference * 100, distance, now)
+
+    async def _fetch_chunk(self, chunk_tokens: list[str], semaphore: asyncio.Semaphore) -> dict[str, QuoteDTO] | None:
+        index = self.registry.index
+        # Asks alone come from the light /prices endpoint; any bid or mid
+        # market in the chunk switches it to one /books call for every kind
+        needs_book = any(index.sources(t) - {PriceSource.ASK} for t in chunk_tokens)
+        async with semaphore:
+            try:
+                if needs_book:
+                    return await self.polymarket_api.get_quotes_batch(chunk_tokens)
+                prices = await self.polymarket_api.get_prices_batch(chunk_tokens)
+                return {token_id: QuoteDTO(ask=price) for token_id, price in prices.items()}
+            except PolymarketUnavailableError:
+                return None
+            except Exception as e:
+                logger.error(f"Error fetching batch of {len(chunk_tokens)} tokens: {e}")
+                return {}
+
+    async def _on_stream_prices(self, quotes: dict[str, QuoteDTO]):
+        await self._flush_triggered(self._collect_triggered(quotes))
+
+    async def _flush_triggered(self, triggered: list[tuple[ActiveMarketDTO, float]]):
+        if not triggered:
+            return
+        market_ids = [m.id for m, _ in triggered]
+        try:
+            # Only triggered markets need the DB, steady-state ticks never open a session
+            async with self.session_maker() as session:
+                market_repo = SQLAlchemyMarketRepository(session)
+                # The index does not keep titles and URLs, load them for the alerts
+                details = {m.id: m for m in await market_repo.get_markets_by_ids(market_ids)}
+                deactivated = set(await market_repo.deactivate_markets(market_ids))
+        except Exception as e:
+            logger.error(f"Failed to deactivate {len(triggered)} triggered markets: {e}")
+            # Put them back so the next tick can retry
+            for market, _ in triggered:
+                await self.registry.restore(market)
+            return
+
+        for market, current_price in triggered:
+            self.registry.release(market.id)
+            # Markets paused or deleted in the meantime were not active anymore
+            if market.id in deactivated and market.id in details:
+                self.notify(details[market.id], current_price)
+
+    def _collect_triggered(self, quotes: dict[str, QuoteDTO]) -> list[tuple[ActiveMarketDTO, float]]:
+        # Synchronous on purpose: polling and streaming share the index and
+        # a market is claimed before any await, so it can only fire once.
+        triggered = []
+        index = self.registry.index
+        for token_id, quote in quotes.items():
+            # Tokens that moved to another worker may still be in flight here
+            if self.shard and not self.shard.owns(token_id):
+                continue
+            metrics.MONITOR_TOKENS_EVALUATED.inc()
+            metrics.MONITOR_MARKETS_EVALUATED.inc(index.market_count(token_id))
+            for market in index.triggered(token_id, quote):
+                current_price = quote.price(market.price_source) * 100
+                logger.info(
+                    f"Market {market.id} triggered ({market.condition.name}, {market.price_source.value}): "
+                    f"{current_price}% vs target {market.target_price}%"
+                )
+                self.registry.claim(market.id)
+                triggered.append((market, current_price))
+        metrics.MONITOR_MARKETS_TRIGGERED.inc(len(triggered))
+        return triggered
+
+    def notify(self, market: MarketDTO, current_price: float):
         logger.info(f"Market {market.id} triggered! Price: {current_price}, Target: {market.target_price}")
-        
-        # Disable monitoring
-        await market_repo.update_market_status(market.id, is_active=False)
-        
+
         # Send notification
         i18n = self.translator_hub.get_translator_by_locale("uk")
         text = i18n.monitor_alert_text(
@@ -109,7 +337,24 @@ class MarketMonitorService:
             [InlineKeyboardButton(text=i18n.monitor_alert_btn_resume(), callback_data=f"enable_mon:{market.id}")]
         ])
         
+        # Delivery happens on the dispatcher workers, never inside the tick
+        self.notifier.enqueue(Notification(market.user_id, text, reply_markup=keyboard, market_id=market.id))
+
+    async def reactivate_undelivered(self, notifications: list[Notification]):
+        """
+        Enable the markets again whose alert was never sent.
+
+        `_flush_triggered` disabled them before the alert was queued, so
+        without this the alert is lost; active again, they trigger on the
+        next start if the price is still past the target.
+        """
+        market_ids = [n.market_id for n in notifications if n.market_id is not None]
+        if not market_ids:
+            return
         try:
-            await self.bot.send_message(market.user_id, text, reply_markup=keyboard)
+            async with self.session_maker() as session:
+                reactivated = await SQLAlchemyMarketRepository(session).reactivate_markets(market_ids)
         except Exception as e:
-            logger.error(f"Failed to send notification to {market.user_id}: {e}")
+            logger.error(f"Failed to reactivate {len(market_ids)} markets with undelivered alerts: {e}")
+            return
+        logger.info(f"Reactivated {len(reactivated)} markets whose alert was not delivered")
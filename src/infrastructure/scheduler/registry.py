@@ -0,0 +1,139 @@
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.domain.entities.market import ActiveMarketDTO, MarketDTO
+from src.domain.protocols.market_events import MarketEventPublisher
+from src.infrastructure.db.repositories.market import SQLAlchemyMarketRepository
+from src.infrastructure.scheduler.threshold_index import ThresholdIndex
+
+logger = logging.getLogger(__name__)
+
+TokensListener = Callable[[set[str]], Awaitable[None]]
+# Called with the token of a market that was added, restored or got a new target
+TargetsListener = Callable[[str], None]
+
+# Rows read per round trip while rebuilding the index
+LOAD_BATCH_SIZE = 5_000
+
+
+class ActiveMarketRegistry(MarketEventPublisher):
+    """
+    In-process view of the active markets, loaded once at startup.
+
+    Use cases publish every change through `MarketEventPublisher`, so the
+    monitor never has to read the table on a tick. `reconcile` periodically
+    rebuilds the index from the DB to repair any drift.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker):
+        self.session_maker = session_maker
+        self.index = ThresholdIndex()
+        self._listeners: list[TokensListener] = []
+        self._targets_listeners: list[TargetsListener] = []
+        # Markets already triggered whose deactivation may not be committed yet
+        self._pending: set[int] = set()
+        self._version = 0
+        self._loaded = False
+
+    def add_tokens_listener(self, listener: TokensListener):
+        self._listeners.append(listener)
+
+    def add_targets_listener(self, listener: TargetsListener):
+        self._targets_listeners.append(listener)
+
+    async def load(self):
+        await self.reconcile()
+        self._loaded = True
+        logger.info(f"Loaded {len(self.index)} active markets for {len(self.index.token_ids)} tokens")
+
+    async def reconcile(self):
+        version = self._version
+        # Build the new index batch by batch, so only the slim rows it keeps
+        # are ever held in memory, never the whole result set
+        index = ThresholdIndex()
+        without_token = 0
+        async with self.session_maker() as session:
+            market_repo = SQLAlchemyMarketRepository(session)
+            async for batch in market_repo.stream_active_markets(LOAD_BATCH_SIZE):
+                for market in batch:
+                    # Since we enforce token_id, we can skip any (legacy) records that might still miss it
+                    if not market.token_id:
+                        without_token += 1
+                    elif market.id not in self._pending:
+                        index.add(market)
+
+        if version != self._version:
+            # An event landed while we were reading; our snapshot may be older
+            # than the index. The next reconciliation will catch up.
+            logger.info("Registry changed during reconciliation, skipping")
+            return
+
+        if without_token:
+            logger.warning(f"Found {without_token} active markets without token_id. Skipping them.")
+
+        if self._loaded and len(index) != len(self.index):
+            logger.warning(f"Registry drift: {len(self.index)} in memory, {len(index)} in DB")
+        old_tokens = set(self.index.token_ids)
+        self.index = index
+        new_tokens = set(index.token_ids)
+        if new_tokens != old_tokens:
+            await self._notify_tokens()
+
+    def claim(self, market_id: int) -> ActiveMarketDTO | None:
+        """Take a triggered market out of the index until `release` is called."""
+        self._pending.add(market_id)
+        return self.index.remove(market_id)
+
+    def release(self, market_id: int):
+        self._pending.discard(market_id)
+
+    async def restore(self, market: ActiveMarketDTO):
+        """Put a claimed market back whose deactivation failed, so the next tick retries it."""
+        self.release(market.id)
+        self._version += 1
+        had_token = self.index.has_token(market.token_id)
+        self.index.add(market)
+        self._notify_targets(market.token_id)
+        if not had_token:
+            await self._notify_tokens()
+
+    async def market_saved(self, market: MarketDTO) -> None:
+        await self.apply_saved(ActiveMarketDTO.from_market(market), market.is_active)
+
+    async def apply_saved(self, market: ActiveMarketDTO, is_active: bool) -> None:
+        """`market_saved` for the fields the index keeps, e.g. relayed from another worker."""
+        self._version += 1
+        previous = self.index.get(market.id)
+        tokens = {m.token_id for m in (market, previous) if m is not None and m.token_id}
+        before = {t for t in tokens if self.index.has_token(t)}
+
+        self.index.remove(market.id)
+        if is_active and market.token_id and market.id not in self._pending:
+            self.index.add(market)
+            self._notify_targets(market.token_id)
+
+        if before != {t for t in tokens if self.index.has_token(t)}:
+            await self._notify_tokens()
+
+    async def market_deleted(self, market_id: int) -> None:
+        self._version += 1
+        previous = self.index.remove(market_id)
+        if previous is not None and not self.index.has_token(previous.token_id):
+            await self._notify_tokens()
+
+    def _notify_targets(self, token_id: str):
+        for listener in self._targets_listeners:
+            try:
+                listener(token_id)
+            except Exception as e:
+                logger.error(f"Error notifying registry listener: {e}")
+
+    async def _notify_tokens(self):
+        tokens = set(self.index.token_ids)
+        for listener in self._listeners:
+            try:
+                await listener(tokens)
+            except Exception as e:
+                logger.error(f"Error notifying registry listener: {e}")
@@ -0,0 +1,124 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+
+from src.domain.entities.market import ActiveMarketDTO, MarketCondition, PriceSource, QuoteDTO
+
+
+@dataclass
+class _TokenThresholds:
+    # Both lists hold (target_price, market id) tuples sorted by target.
+    le: list[tuple[int, int]] = field(default_factory=list)
+    ge: list[tuple[int, int]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.le or self.ge)
+
+
+class ThresholdIndex:
+    """
+    In-memory index of active markets keyed by token_id.
+
+    For every token and price source the LE and GE targets are kept sorted,
+    so the markets triggered by a quote are found with a single bisect per
+    side instead of scanning every active market.
+    """
+
+    def __init__(self):
+        self._tokens: dict[str, dict[PriceSource, _TokenThresholds]] = {}
+        self._markets: dict[int, ActiveMarketDTO] = {}
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __contains__(self, market_id: int) -> bool:
+        return market_id in self._markets
+
+    @property
+    def token_ids(self) -> list[str]:
+        return list(self._tokens)
+
+    def has_token(self, token_id: str) -> bool:
+        return token_id in self._tokens
+
+    def market_count(self, token_id: str) -> int:
+        sources = self._tokens.get(token_id, {})
+        return sum(len(thresholds.le) + len(thresholds.ge) for thresholds in sources.values())
+
+    def sources(self, token_id: str) -> set[PriceSource]:
+        """Price sources the token's markets fire on."""
+        return set(self._tokens.get(token_id, ()))
+
+    def get(self, market_id: int) -> ActiveMarketDTO | None:
+        return self._markets.get(market_id)
+
+    def add(self, market: ActiveMarketDTO) -> None:
+        if market.id in self._markets:
+            self.remove(market.id)
+
+        sources = self._tokens.setdefault(market.token_id, {})
+        thresholds = sources.setdefault(market.price_source, _TokenThresholds())
+        side = thresholds.le if market.condition == MarketCondition.LE else thresholds.ge
+        insort(side, (market.target_price, market.id))
+        self._markets[market.id] = market
+
+    def remove(self, market_id: int) -> ActiveMarketDTO | None:
+        market = self._markets.pop(market_id, None)
+        if market is None:
+            return None
+
+        sources = self._tokens[market.token_id]
+        thresholds = sources[market.price_source]
+        side = thresholds.le if market.condition == MarketCondition.LE else thresholds.ge
+        entry = (market.target_price, market.id)
+        idx = bisect_left(side, entry)
+        if idx < len(side) and side[idx] == entry:
+            del side[idx]
+
+        if not thresholds:
+            del sources[market.price_source]
+            if not sources:
+                del self._tokens[market.token_id]
+        return market
+
+    def triggered(self, token_id: str, quote: QuoteDTO) -> list[ActiveMarketDTO]:
+        """Return markets whose condition holds for the price their source reads from `quote`."""
+        triggered = []
+        for source, thresholds in self._tokens.get(token_id, {}).items():
+            price = quote.price(source)
+            if price is None:
+                continue
+            current_price = price * 100  # targets are 0-100
+
+            # LE fires when current_price <= target, i.e. every target >= price.
+            le_start = bisect_left(thresholds.le, (current_price,))
+            # GE fires when current_price >= target, i.e. every target <= price.
+            ge_end = bisect_right(thresholds.ge, (current_price, math.inf))
+
+            triggered.extend(
+                self._markets[market_id]
+                for _, market_id in (*thresholds.le[le_start:], *thresholds.ge[:ge_end])
+            )
+        return triggered
+
+    def distance_to_nearest(self, token_id: str, quote: QuoteDTO) -> float | None:
+        """Points the price has to move before the closest untriggered target fires."""
+        sources = self._tokens.get(token_id)
+        if sources is None:
+            return None
+
+        distances = []
+        for source, thresholds in sources.items():
+            price = quote.price(source)
+            if price is None:
+                continue
+            current_price = price * 100
+
+            # Untriggered LE targets are below the price, GE targets above it.
+            le_start = bisect_left(thresholds.le, (current_price,))
+            if le_start > 0:
+                distances.append(current_price - thresholds.le[le_start - 1][0])
+            ge_end = bisect_right(thresholds.ge, (current_price, math.inf))
+            if ge_end < len(thresholds.ge):
+                distances.append(thresholds.ge[ge_end][0] - current_price)
+        return min(distances, default=0.0)
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+
+from redis.asyncio import Redis
+
+from src.domain.entities.market import ActiveMarketDTO, MarketCondition, MarketDTO, PriceSource
+from src.domain.protocols.market_events import MarketEventPublisher
+from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryBroadcast(MarketEventPublisher):
+    """
+    `MarketEventPublisher` relaying registry changes to every monitor worker.
+
+    Use cases only run in the process polling Telegram, so without this the
+    other workers would learn about added, edited or deleted markets at their
+    next reconciliation. Each change is applied to the local registry first,
+    then published on a Redis pub/sub channel that every worker's registry
+    applies. Pub/sub does not queue messages for disconnected subscribers, so
+    a worker reconciles right after it resubscribes.
+
+    Markets deactivated by the monitor are not relayed: they only fire for the
+    worker owning their token, and the conditional deactivation in the DB keeps
+    a stale copy elsewhere from alerting twice.
+    """
+
+    CHANNEL = "polynotification:monitor:registry"
+
+    def __init__(self, redis: Redis, registry: ActiveMarketRegistry, worker_id: str, retry_seconds: float = 1.0):
+        self.redis = redis
+        self.registry = registry
+        self.worker_id = worker_id
+        self.retry_seconds = retry_seconds
+        self._task: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        # Changes published from here on are not missed
+        await self._subscribed.wait()
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def market_saved(self, market: MarketDTO) -> None:
+        await self.registry.market_saved(market)
+        await self._publish({
+            "event": "saved",
+            "market": {
+                "id": market.id,
+                "user_id": market.user_id,
+                "token_id": market.token_id,
+                "target_price": market.target_price,
+                "condition": market.condition.value,
+                "price_source": market.price_source.value,
+            },
+            "is_active": market.is_active,
+        })
+
+    async def market_deleted(self, market_id: int) -> None:
+        await self.registry.market_deleted(market_id)
+        await self._publish({"event": "deleted", "market_id": market_id})
+
+    async def _publish(self, message: dict):
+        message["origin"] = self.worker_id
+        try:
+            await self.redis.publish(self.CHANNEL, json.dumps(message))
+        except Exception as e:
+            # Other workers catch up at their next reconciliation
+            logger.warning(f"Failed to broadcast registry change: {e}")
+
+    async def _apply(self, message: dict):
+        if message.get("origin") == self.worker_id:
+            return
+        if message["event"] == "saved":
+            market = message["market"]
+            await self.registry.apply_saved(
+                ActiveMarketDTO(
+                    id=market["id"],
+                    user_id=market["user_id"],
+                    token_id=market["token_id"],
+                    target_price=market["target_price"],
+                    condition=MarketCondition(market["condition"]),
+                    price_source=PriceSource(market["price_source"]),
+                ),
+                message["is_active"],
+            )
+        elif message["event"] == "deleted":
+            await self.registry.market_deleted(message["market_id"])
+
+    async def _run(self):
+        resubscribed = False
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                self._subscribed.set()
+                if resubscribed:
+                    await self.registry.reconcile()
+                async for raw in pubsub.listen():
+                    try:
+                        await self._apply(json.loads(raw["data"]))
+                    except Exception as e:
+                        logger.error(f"Failed to apply registry change {raw['data']!r}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Registry broadcast subscription failed: {e}")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            resubscribed = True
+            # Do not hold up startup if Redis is down; the retry catches up later
+            self._subscribed.set()
+            await asyncio.sleep(self.retry_seconds)
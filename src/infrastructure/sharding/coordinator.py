@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import time
+from bisect import bisect_right
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+RebalanceListener = Callable[[], Awaitable[None]]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: list[str], virtual_nodes: int = 64):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node in nodes
+            for i in range(virtual_nodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [n for _, n in points]
+
+    def node_for(self, key: str) -> str | None:
+        if not self._hashes:
+            return None
+        idx = bisect_right(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[idx]
+
+
+class ShardCoordinator:
+    """
+    Splits token_ids between monitor workers through Redis.
+
+    Every worker keeps a lease in a sorted set, scored by its last heartbeat.
+    Workers whose lease expired are dropped, and each worker builds the same
+    consistent hash ring from the live members, so adding or losing a worker
+    only moves that worker's share of tokens. A worker that cannot reach
+    Redis for longer than its lease stops claiming tokens, since others may
+    already have taken them over.
+    """
+
+    WORKERS_KEY = "polynotification:monitor:workers"
+
+    def __init__(
+        self,
+        redis: Redis,
+        worker_id: str | None = None,
+        lease_seconds: float = 15.0,
+        heartbeat_seconds: float = 5.0,
+        virtual_nodes: int = 64,
+    ):
+        self.redis = redis
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.virtual_nodes = virtual_nodes
+
+        self.members: list[str] = []
+        self._ring = HashRing([])
+        self._last_heartbeat = 0.0
+        self._listeners: list[RebalanceListener] = []
+        self._task: asyncio.Task | None = None
+
+    def add_rebalance_listener(self, listener: RebalanceListener):
+        self._listeners.append(listener)
+
+    @property
+    def has_lease(self) -> bool:
+        return time.monotonic() - self._last_heartbeat < self.lease_seconds
+
+    def owns(self, token_id: str) -> bool:
+        return self.has_lease and self._ring.node_for(token_id) == self.worker_id
+
+    def filter(self, token_ids: list[str]) -> list[str]:
+        if not self.has_lease:
+            return []
+        return [t for t in token_ids if self._ring.node_for(t) == self.worker_id]
+
+    async def start(self):
+        await self.heartbeat()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            # Leave right away so the others pick up our tokens without waiting for the lease
+            await self.redis.zrem(self.WORKERS_KEY, self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to release shard lease: {e}")
+
+    async def heartbeat(self):
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.WORKERS_KEY, {self.worker_id: now})
+            pipe.zremrangebyscore(self.WORKERS_KEY, "-inf", now - self.lease_seconds)
+            pipe.zrange(self.WORKERS_KEY, 0, -1)
+            _, _, members = await pipe.execute()
+        self._last_heartbeat = time.monotonic()
+
+        members = sorted(m.decode() if isinstance(m, bytes) else m for m in members)
+        if members != self.members:
+            logger.info(f"Monitor shard members changed: {self.members} -> {members}")
+            self.members = members
+            self._ring = HashRing(members, self.virtual_nodes)
+            for listener in self._listeners:
+                try:
+                    await listener()
+                except Exception as e:
+                    logger.error(f"Error notifying rebalance listener: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Shard heartbeat failed: {e}")
@@ -27,6 +27,11 @@ market_view_info = { $icon } { $title }<br><br><b>Статус монітори
 market_view_open_polymarket = Відкрити на Polymarket
 market_view_edit_price = Змінити цільову ціну
 market_view_delete = 🗑️ Видалити
+market_view_price_source = 💱 Ціна: { $source }
+market_price_source_ask = ask
+market_price_source_bid = bid
+market_price_source_mid = середня
+market_price_source_changed = Сповіщення спрацює за ціною: { $source }.
 common_back = ⬅️ Назад
 market_edit_price_prompt = Змініть цільову ціну події або введіть вручну
 market_updated_success = Подію успішно оновлено!
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import signal
 from urllib.parse import quote
 
 from aiogram import Bot, Dispatcher
@@ -11,16 +12,25 @@ from sulguk import AiogramSulgukMiddleware, SULGUK_PARSE_MODE
 
 from src.bootstrap.config import Settings, get_settings
 from src.bootstrap.database import create_engine_factory, create_session_maker
-from src.infrastructure.polymarket.client import PolymarketApiClient
+from src.infrastructure.db.repositories.cached_user import UserProfileCache
+from src.infrastructure.metrics import instrument_engine, start_metrics_server
+from src.infrastructure.notifications.dispatcher import NotificationDispatcher
+from src.infrastructure.polymarket.cache import CachedPolymarketAPI
+from src.infrastructure.polymarket.client import PolymarketApiClient, PoolConfig
+from src.infrastructure.polymarket.resilience import RetryPolicy
 from src.infrastructure.scheduler.monitoring import MarketMonitorService
+from src.infrastructure.scheduler.registry import ActiveMarketRegistry
+from src.infrastructure.sharding.broadcast import RegistryBroadcast
+from src.infrastructure.sharding.coordinator import ShardCoordinator
 from src.presentation.handlers.start import router as start_router
 from src.presentation.handlers.market import router as market_router
 from src.presentation.handlers.errors import router as errors_router
 from src.presentation.dialogs.add_market import add_market_dialog
 from src.presentation.dialogs.market_list import market_list_dialog
 from src.presentation.middlewares.db import DbSessionMiddleware
-from src.presentation.middlewares.use_cases import UseCaseMiddleware
+from src.presentation.middlewares.use_cases import HandlerUseCasesMiddleware, UseCaseMiddleware
 from src.presentation.middlewares.i18n import I18nMiddleware
+from src.presentation.middlewares.metrics import HandlerMetricsMiddleware
 from src.infrastructure.i18n.setup import setup_i18n
 
 
@@ -34,6 +44,14 @@ def build_redis_dsn(settings: Settings) -> str:
     return f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
 
 
+async def wait_for_shutdown():
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    await stopped.wait()
+
+
 async def main():
     logging.basicConfig(
         level=logging.INFO,
@@ -45,10 +63,52 @@ async def main():
     
     # Database setup
     engine = create_engine_factory()
+    instrument_engine(engine)
     session_maker = create_session_maker(engine)
     
+    market_registry = ActiveMarketRegistry(session_maker)
+
     # API Client setup
-    polymarket_api = PolymarketApiClient()
+    polymarket_api = PolymarketApiClient(
+        gamma_pool=PoolConfig(
+            rate=settings.polymarket_gamma_rate,
+            limit=settings.polymarket_pool_limit,
+            limit_per_host=settings.polymarket_gamma_limit_per_host,
+            dns_cache_seconds=settings.polymarket_dns_cache_seconds,
+            keepalive_seconds=settings.polymarket_keepalive_seconds,
+            connect_timeout=settings.polymarket_connect_timeout,
+            total_timeout=settings.polymarket_gamma_timeout,
+        ),
+        clob_pool=PoolConfig(
+            rate=settings.polymarket_clob_rate,
+            limit=settings.polymarket_pool_limit,
+            limit_per_host=settings.polymarket_clob_limit_per_host,
+            dns_cache_seconds=settings.polymarket_dns_cache_seconds,
+            keepalive_seconds=settings.polymarket_keepalive_seconds,
+            connect_timeout=settings.polymarket_connect_timeout,
+            total_timeout=settings.polymarket_clob_timeout,
+        ),
+        retry=RetryPolicy(
+            attempts=settings.polymarket_retry_attempts,
+            base_delay=settings.polymarket_retry_base_delay,
+            max_delay=settings.polymarket_retry_max_delay,
+        ),
+        breaker_threshold=settings.polymarket_breaker_threshold,
+        breaker_recovery_seconds=settings.polymarket_breaker_recovery_seconds,
+        gamma_url=settings.polymarket_gamma_url,
+        clob_url=settings.polymarket_clob_url,
+    )
+    await polymarket_api.start()
+    # Dialogs and use cases read market info through the cache, the monitor polls the client directly
+    cached_polymarket_api = CachedPolymarketAPI(
+        polymarket_api,
+        max_entries=settings.market_cache_size,
+        metadata_ttl=settings.market_cache_metadata_ttl,
+        price_ttl=settings.market_cache_price_ttl,
+        event_ttl=settings.event_cache_ttl,
+        event_max_stale=settings.event_cache_max_stale,
+        max_event_markets=settings.event_cache_max_markets,
+    )
     
     # I18n setup
     translator_hub = setup_i18n()
@@ -64,12 +124,44 @@ async def main():
         key_builder=DefaultKeyBuilder(with_bot_id=True, with_destiny=True),
     )
     dp = Dispatcher(storage=storage)
-    
+
+    # Sharding: split tokens between workers and relay registry changes to all of them
+    shard = None
+    registry_broadcast = None
+    if settings.monitor_sharding:
+        shard = ShardCoordinator(
+            storage.redis,
+            worker_id=settings.monitor_worker_id,
+            lease_seconds=settings.monitor_shard_lease_seconds,
+            heartbeat_seconds=settings.monitor_shard_lease_seconds / 3,
+        )
+        registry_broadcast = RegistryBroadcast(storage.redis, market_registry, shard.worker_id)
+        # Subscribe before the registry loads, so no change falls in between
+        await registry_broadcast.start()
+    elif settings.monitor_only:
+        logger.warning("MONITOR_ONLY without MONITOR_SHARDING: this worker checks every market on its own")
+
     # Middleware
     dp.update.middleware(DbSessionMiddleware(session_maker))
-    dp["polymarket_api"] = polymarket_api
+    dp["polymarket_api"] = cached_polymarket_api
+    dp["market_registry"] = registry_broadcast or market_registry
+    user_profile_cache = None
+    if settings.user_profile_cache and not settings.monitor_only:
+        user_profile_cache = UserProfileCache(
+            session_maker,
+            redis=storage.redis if settings.user_profile_cache_redis else None,
+            max_entries=settings.user_profile_cache_size,
+            redis_ttl=settings.user_profile_cache_ttl,
+            flush_seconds=settings.user_profile_flush_seconds,
+        )
+        await user_profile_cache.start()
+        dp["user_profile_cache"] = user_profile_cache
     dp.update.middleware(UseCaseMiddleware())
     dp.update.middleware(I18nMiddleware(translator_hub))
+    for event_type, observer in dp.observers.items():
+        if event_type not in ("update", "error"):
+            observer.middleware(HandlerUseCasesMiddleware())
+            observer.middleware(HandlerMetricsMiddleware(event_type))
     
     # Router setup
     errors_router.include_routers(
@@ -83,24 +175,64 @@ async def main():
     
     setup_dialogs(dp)
 
+    # Notifications
+    notifier = NotificationDispatcher(
+        bot,
+        workers=settings.notify_workers,
+        global_rate=settings.notify_global_rate,
+        per_chat_rate=settings.notify_per_chat_rate,
+    )
+    await notifier.start()
+
     # Monitoring Service
     scheduler = AsyncIOScheduler()
     monitor_service = MarketMonitorService(
         session_maker=session_maker,
         polymarket_api=polymarket_api,
-        bot=bot,
+        notifier=notifier,
         scheduler=scheduler,
         translator_hub=translator_hub,
+        registry=market_registry,
+        chunk_size=settings.monitor_chunk_size,
+        fetch_concurrency=settings.monitor_fetch_concurrency,
+        streaming=settings.monitor_streaming,
+        stream_url=settings.polymarket_ws_url,
+        stream_stale_seconds=settings.monitor_stream_stale_seconds,
+        reconcile_seconds=settings.monitor_reconcile_seconds,
+        interval_seconds=settings.monitor_interval_seconds,
+        tick_jitter_seconds=settings.monitor_tick_jitter_seconds,
+        tick_budget_seconds=settings.monitor_tick_budget_seconds,
+        adaptive_cadence=settings.monitor_adaptive_cadence,
+        shard=shard,
     )
     
     await monitor_service.start()
-    
-    logger.info("Starting bot...")
+
+    metrics_runner = None
+    if settings.metrics_enabled:
+        metrics_runner = await start_metrics_server(settings.metrics_host, settings.metrics_port)
+
     try:
-        await dp.start_polling(bot)
+        if settings.monitor_only:
+            # Only one process may poll getUpdates per bot token, the others just monitor
+            logger.info("Starting monitor-only worker...")
+            await wait_for_shutdown()
+        else:
+            logger.info("Starting bot...")
+            await dp.start_polling(bot)
     finally:
+        await monitor_service.stop()
+        if registry_broadcast:
+            await registry_broadcast.stop()
+        undelivered = await notifier.stop(drain_timeout=settings.notify_drain_seconds)
+        await monitor_service.reactivate_undelivered(undelivered)
+        if user_profile_cache:
+            await user_profile_cache.stop()
+        await cached_polymarket_api.close()
         await polymarket_api.close()
         await dp.storage.close()
+        if metrics_runner:
+            await metrics_runner.cleanup()
         await engine.dispose()
 
 
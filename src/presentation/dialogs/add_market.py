@@ -12,7 +12,9 @@ from fluentogram import TranslatorRunner
 from src.presentation.states import AddMarketSG, MarketListSG
 from src.use_cases.market.add import AddMarketUseCase
 from src.use_cases.market.check_exists import CheckMarketExistsUseCase
-from src.domain.exceptions import MarketAlreadyExistsError
+from src.use_cases.user.create import CreateUserUseCase
+from src.domain.exceptions import MarketAlreadyExistsError, UserNotFoundError
+from src.infrastructure.db.repositories.cached_user import UserProfileCache
 
 
 async def on_dialog_start(start_data: dict, manager: DialogManager):
@@ -55,7 +57,7 @@ async def get_exists_strings(dialog_manager: DialogManager, **kwargs):
 
 async def on_market_option_selected(c: CallbackQuery, widget: Any, manager: DialogManager, item_id: str):
     market_id = item_id
-    check_exists: CheckMarketExistsUseCase = manager.middleware_data["check_market_exists_use_case"]
+    check_exists: CheckMarketExistsUseCase = manager.middleware_data["use_cases"].check_market_exists_use_case
     user_id = c.from_user.id
     
     existing_market = await check_exists(user_id, market_id)
@@ -82,8 +84,23 @@ async def on_manual_price_input(message: Message, widget: MessageInput, manager:
         await message.answer(i18n.err_invalid_number())
 
 
+async def _add_market(manager: DialogManager, **kwargs):
+    add_market_use_case: AddMarketUseCase = manager.middleware_data["use_cases"].add_market_use_case
+    try:
+        return await add_market_use_case(**kwargs)
+    except UserNotFoundError:
+        # The profile cache skipped /start for a user the DB no longer has:
+        # forget them so the user is written through, then try once more
+        user: User = manager.event.from_user
+        user_profile_cache: UserProfileCache | None = manager.middleware_data.get("user_profile_cache")
+        if user_profile_cache is not None:
+            await user_profile_cache.forget(user.id)
+        create_user_use_case: CreateUserUseCase = manager.middleware_data["use_cases"].create_user_use_case
+        await create_user_use_case(user_id=user.id, username=user.username, full_name=user.full_name)
+        return await add_market_use_case(**kwargs)
+
+
 async def _save_market(manager: DialogManager, price: int):
-    add_market_use_case: AddMarketUseCase = manager.middleware_data["add_market_use_case"]
     i18n: TranslatorRunner = manager.middleware_data["i18n"]
     url = manager.dialog_data["url"]
     market_id = manager.dialog_data["market_id"]
@@ -93,7 +110,8 @@ async def _save_market(manager: DialogManager, price: int):
     await manager.event.answer(i18n.add_market_saving())
     
     try:
-        await add_market_use_case(
+        await _add_market(
+            manager,
             user_id=user_id, 
             market_id=market_id, 
             market_url=url, 
@@ -9,12 +9,14 @@ from aiogram_dialog.widgets.kbd import Button, Cancel, ScrollingGroup, Select, S
 from aiogram_dialog.widgets.text import Const, Format
 from fluentogram import TranslatorRunner
 
+from src.domain.entities.market import PriceSource
 from src.presentation.states import MarketListSG
 from src.use_cases.market.list import ListUserMarketsUseCase
 from src.use_cases.market.update import UpdateMarketUseCase
 from src.use_cases.market.delete import DeleteMarketUseCase
 from src.use_cases.market.get import GetMarketUseCase
 from src.use_cases.market.toggle_monitoring import ToggleMonitoringUseCase
+from src.use_cases.market.set_price_source import SetPriceSourceUseCase
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,7 @@ async def on_dialog_start(start_data: dict, manager: DialogManager):
 
 
 async def get_markets(dialog_manager: DialogManager, **kwargs):
-    list_use_case: ListUserMarketsUseCase = dialog_manager.middleware_data["list_markets_use_case"]
+    list_use_case: ListUserMarketsUseCase = dialog_manager.middleware_data["use_cases"].list_markets_use_case
     i18n: TranslatorRunner = dialog_manager.middleware_data["i18n"]
     user_id = dialog_manager.event.from_user.id
     markets = await list_use_case(user_id)
@@ -39,7 +41,7 @@ async def get_markets(dialog_manager: DialogManager, **kwargs):
 
 
 async def get_selected_market(dialog_manager: DialogManager, **kwargs):
-    get_use_case: GetMarketUseCase = dialog_manager.middleware_data["get_market_use_case"]
+    get_use_case: GetMarketUseCase = dialog_manager.middleware_data["use_cases"].get_market_use_case
     i18n: TranslatorRunner = dialog_manager.middleware_data["i18n"]
     polymarket_api = dialog_manager.middleware_data.get("polymarket_api")
     market_id = dialog_manager.dialog_data.get("selected_market_id")
@@ -52,8 +54,13 @@ async def get_selected_market(dialog_manager: DialogManager, **kwargs):
     current_price_text = "N/A"
     if polymarket_api:
         try:
-            market_info = await polymarket_api.get_market_info(market.market_id)
-            current_price = market_info.price * 100  # Convert 0-1 price to cents/percent
+            price = None
+            if market.price_source != PriceSource.ASK and market.token_id:
+                quote = (await polymarket_api.get_quotes_batch([market.token_id])).get(market.token_id)
+                price = quote.price(market.price_source) if quote else None
+            if price is None:
+                price = (await polymarket_api.get_market_info(market.market_id)).price
+            current_price = price * 100  # Convert 0-1 price to cents/percent
             current_price_text = f"{current_price:.2f}"
         except Exception as exc:
             logger.warning(
@@ -84,6 +91,7 @@ async def get_selected_market(dialog_manager: DialogManager, **kwargs):
         "text_open_polymarket": i18n.market_view_open_polymarket(),
         "text_edit_price": i18n.market_view_edit_price(),
         "text_delete": i18n.market_view_delete(),
+        "text_price_source": i18n.market_view_price_source(source=_price_source_name(i18n, market.price_source)),
         "text_back": i18n.common_back()
     }
 
@@ -116,7 +124,7 @@ async def on_manual_price_update(message: Message, widget: MessageInput, manager
 
 
 async def _update_market_price(manager: DialogManager, price: int):
-    update_use_case: UpdateMarketUseCase = manager.middleware_data["update_market_use_case"]
+    update_use_case: UpdateMarketUseCase = manager.middleware_data["use_cases"].update_market_use_case
     i18n: TranslatorRunner = manager.middleware_data["i18n"]
     market_id = manager.dialog_data["selected_market_id"]
     
@@ -128,7 +136,7 @@ async def _update_market_price(manager: DialogManager, price: int):
 
 
 async def on_delete_market(c: CallbackQuery, widget: Any, manager: DialogManager):
-    delete_use_case: DeleteMarketUseCase = manager.middleware_data["delete_market_use_case"]
+    delete_use_case: DeleteMarketUseCase = manager.middleware_data["use_cases"].delete_market_use_case
     i18n: TranslatorRunner = manager.middleware_data["i18n"]
     market_id = manager.dialog_data["selected_market_id"]
     
@@ -139,8 +147,8 @@ async def on_delete_market(c: CallbackQuery, widget: Any, manager: DialogManager
 
 
 async def on_toggle_monitoring(c: CallbackQuery, widget: Any, manager: DialogManager):
-    toggle_use_case: ToggleMonitoringUseCase = manager.middleware_data["toggle_monitoring_use_case"]
-    get_use_case: GetMarketUseCase = manager.middleware_data["get_market_use_case"]
+    toggle_use_case: ToggleMonitoringUseCase = manager.middleware_data["use_cases"].toggle_monitoring_use_case
+    get_use_case: GetMarketUseCase = manager.middleware_data["use_cases"].get_market_use_case
     i18n: TranslatorRunner = manager.middleware_data["i18n"]
     market_id = manager.dialog_data["selected_market_id"]
     
@@ -157,6 +165,33 @@ async def on_toggle_monitoring(c: CallbackQuery, widget: Any, manager: DialogMan
     await manager.switch_to(MarketListSG.view_market)
 
 
+def _price_source_name(i18n: TranslatorRunner, price_source: PriceSource) -> str:
+    names = {
+        PriceSource.ASK: i18n.market_price_source_ask,
+        PriceSource.BID: i18n.market_price_source_bid,
+        PriceSource.MID: i18n.market_price_source_mid,
+    }
+    return names[price_source]()
+
+
+async def on_cycle_price_source(c: CallbackQuery, widget: Any, manager: DialogManager):
+    set_source_use_case: SetPriceSourceUseCase = manager.middleware_data["use_cases"].set_price_source_use_case
+    get_use_case: GetMarketUseCase = manager.middleware_data["use_cases"].get_market_use_case
+    i18n: TranslatorRunner = manager.middleware_data["i18n"]
+    market_id = manager.dialog_data["selected_market_id"]
+
+    market = await get_use_case(market_id)
+    if not market:
+        return
+
+    sources = list(PriceSource)
+    next_source = sources[(sources.index(market.price_source) + 1) % len(sources)]
+    await set_source_use_case(market_id=market_id, price_source=next_source)
+
+    await c.answer(i18n.market_price_source_changed(source=_price_source_name(i18n, next_source)))
+    await manager.switch_to(MarketListSG.view_market)
+
+
 def get_price_buttons_edit():
     # Generate buttons for 5, 10, ... 95
     prices = [(str(i), str(i)) for i in range(5, 100, 5)]
@@ -200,6 +235,7 @@ market_list_dialog = Dialog(
             SwitchTo(Format("{text_edit_price}"), id="edit_price_btn", state=MarketListSG.edit_price),
             Button(Format("{toggle_text}"), id="toggle_mon_btn", on_click=on_toggle_monitoring),
         ),
+        Button(Format("{text_price_source}"), id="price_source_btn", on_click=on_cycle_price_source),
         Button(Format("{text_delete}"), id="delete_market", on_click=on_delete_market),
         Back(Format("{text_back}")),
         state=MarketListSG.view_market,
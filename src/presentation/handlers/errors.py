@@ -7,7 +7,7 @@ from aiogram.types import ErrorEvent
 from src.domain.exceptions import ApplicationException
 
 logger = logging.getLogger(__name__)
-router = Router()
+router = Router(name="errors")
 
 
 @router.error(ExceptionTypeFilter(ApplicationException))
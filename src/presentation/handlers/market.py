@@ -16,7 +16,7 @@ from src.use_cases.market.toggle_monitoring import ToggleMonitoringUseCase
 from src.domain.exceptions import MarketNotFoundError, MarketApiError
 
 logger = logging.getLogger(__name__)
-router = Router()
+router = Router(name="market")
 
 
 @router.message(F.text.regexp(POLYMARKET_URL_PATTERN))
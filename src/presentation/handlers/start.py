@@ -5,7 +5,7 @@ from fluentogram import TranslatorRunner
 
 from src.use_cases.user.create import CreateUserUseCase
 
-router = Router()
+router = Router(name="start")
 
 
 @router.message(CommandStart())
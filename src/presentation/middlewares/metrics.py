@@ -0,0 +1,30 @@
+import time
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.infrastructure.metrics import HANDLER_SECONDS
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware timing the matched handler, labelled by its router."""
+
+    def __init__(self, event_type: str):
+        self.event_type = event_type
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            router = data.get("event_router")
+            HANDLER_SECONDS.labels(
+                router.name if router else "unknown",
+                self.event_type,
+            ).observe(time.perf_counter() - started)
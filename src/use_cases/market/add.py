@@ -1,6 +1,7 @@
 import logging
 from src.domain.entities.market import MarketDTO, MarketCondition
 from src.domain.protocols.repositories.market import MarketRepository
+from src.domain.protocols.market_events import MarketEventPublisher
 from src.domain.protocols.polymarket import PolymarketAPI
 from src.domain.exceptions import InvalidTargetPriceError, MarketAlreadyExistsError, TokenIdNotFoundError
 
@@ -13,10 +14,12 @@ class AddMarketUseCase:
     def __init__(
         self,
         market_repository: MarketRepository,
-        polymarket_api: PolymarketAPI
+        polymarket_api: PolymarketAPI,
+        market_events: MarketEventPublisher,
     ):
         self.market_repository = market_repository
         self.polymarket_api = polymarket_api
+        self.market_events = market_events
 
     async def __call__(
         self,
@@ -31,12 +34,6 @@ class AddMarketUseCase:
         if not (0 <= target_price <= 100):
             raise InvalidTargetPriceError()
             
-        # Check if market already exists for user
-        existing_market = await self.market_repository.get_market_by_market_id(user_id, market_id)
-        if existing_market:
-            logger.info(f"Market already exists: {existing_market.id}")
-            raise MarketAlreadyExistsError(existing_market.id)
-            
         # Fetch market info to verify it exists and get title
         market_info = await self.polymarket_api.get_market_info(market_id)
         
@@ -72,4 +69,12 @@ class AddMarketUseCase:
             created_at=None
         )
         
-        return await self.market_repository.create_market(market)
+        # The insert itself rejects duplicates, a separate check could race
+        created_market = await self.market_repository.create_market(market)
+        if created_market is None:
+            existing_market = await self.market_repository.get_market_by_market_id(user_id, market_id)
+            logger.info(f"Market {market_id} already exists for user {user_id}")
+            raise MarketAlreadyExistsError(existing_market.id if existing_market else None)
+
+        await self.market_events.market_saved(created_market)
+        return created_market
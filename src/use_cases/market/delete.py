@@ -1,11 +1,14 @@
 from src.domain.protocols.repositories.market import MarketRepository
+from src.domain.protocols.market_events import MarketEventPublisher
 
 
 class DeleteMarketUseCase:
-    def __init__(self, market_repository: MarketRepository):
+    def __init__(self, market_repository: MarketRepository, market_events: MarketEventPublisher):
         self.market_repository = market_repository
+        self.market_events = market_events
 
     async def __call__(self, market_id: int) -> None:
         await self.market_repository.delete_market(market_id)
+        await self.market_events.market_deleted(market_id)
 
 
@@ -0,0 +1,15 @@
+from src.domain.entities.market import MarketDTO, PriceSource
+from src.domain.protocols.repositories.market import MarketRepository
+from src.domain.protocols.market_events import MarketEventPublisher
+
+
+class SetPriceSourceUseCase:
+    def __init__(self, market_repository: MarketRepository, market_events: MarketEventPublisher):
+        self.market_repository = market_repository
+        self.market_events = market_events
+
+    async def __call__(self, market_id: int, price_source: PriceSource) -> MarketDTO | None:
+        market = await self.market_repository.update_price_source(market_id, price_source)
+        if market:
+            await self.market_events.market_saved(market)
+        return market
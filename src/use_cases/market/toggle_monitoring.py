@@ -1,11 +1,16 @@
 from src.domain.entities.market import MarketDTO
 from src.domain.protocols.repositories.market import MarketRepository
+from src.domain.protocols.market_events import MarketEventPublisher
 
 
 class ToggleMonitoringUseCase:
-    def __init__(self, market_repository: MarketRepository):
+    def __init__(self, market_repository: MarketRepository, market_events: MarketEventPublisher):
         self.market_repository = market_repository
+        self.market_events = market_events
 
     async def __call__(self, market_id: int, is_active: bool) -> MarketDTO | None:
-        return await self.market_repository.update_market_status(market_id, is_active=is_active)
+        market = await self.market_repository.update_market_status(market_id, is_active=is_active)
+        if market:
+            await self.market_events.market_saved(market)
+        return market
 
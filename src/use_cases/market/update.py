@@ -1,15 +1,17 @@
 import logging
-from src.domain.entities.market import MarketDTO, MarketCondition
+from src.domain.entities.market import MarketDTO, MarketCondition, PriceSource
 from src.domain.protocols.repositories.market import MarketRepository
+from src.domain.protocols.market_events import MarketEventPublisher
 from src.domain.protocols.polymarket import PolymarketAPI
 from src.domain.exceptions import InvalidTargetPriceError, MarketNotFoundError, MarketApiError
 
 logger = logging.getLogger(__name__)
 
 class UpdateMarketUseCase:
-    def __init__(self, market_repository: MarketRepository, polymarket_api: PolymarketAPI):
+    def __init__(self, market_repository: MarketRepository, polymarket_api: PolymarketAPI, market_events: MarketEventPublisher):
         self.market_repository = market_repository
         self.polymarket_api = polymarket_api
+        self.market_events = market_events
 
     async def __call__(self, market_id: int, new_target_price: int) -> MarketDTO:
         if not (0 <= new_target_price <= 100):
@@ -22,8 +24,7 @@ class UpdateMarketUseCase:
 
         # Fetch current market info to determine condition
         try:
-            market_info = await self.polymarket_api.get_market_info(market.market_id)
-            current_price = market_info.price * 100  # Convert 0-1 to 0-100
+            current_price = await self._current_price(market) * 100  # Convert 0-1 to 0-100
             
             condition = MarketCondition.LE
             if new_target_price > current_price:
@@ -47,5 +48,17 @@ class UpdateMarketUseCase:
         updated_market = await self.market_repository.update_target_price(market_id, new_target_price, condition)
         if not updated_market:
             raise MarketNotFoundError(market_id)
-            
+
+        await self.market_events.market_saved(updated_market)
         return updated_market
+
+    async def _current_price(self, market: MarketDTO) -> float:
+        # Compare the target with the same price the monitor will fire on
+        if market.price_source != PriceSource.ASK and market.token_id:
+            quotes = await self.polymarket_api.get_quotes_batch([market.token_id])
+            quote = quotes.get(market.token_id)
+            price = quote.price(market.price_source) if quote else None
+            if price is not None:
+                return price
+        market_info = await self.polymarket_api.get_market_info(market.market_id)
+        return market_info.price